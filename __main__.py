@@ -1,6 +1,8 @@
 import arcade
 from scripts.world import World
 from scripts.builder import Builder
+from scripts.save import SAVE_PATH
+from scripts.output import warn
 import sys
 import os
 
@@ -13,25 +15,36 @@ HEIGHT = 720
 def main():
     os.chdir('miniquest/')
     world = World()
+    world.save_path = SAVE_PATH
     loop = True
 
     while loop:
         print("""Miniquest\n
             1. New Game
-            2. Exit Game
+            2. Continue
+            3. Exit Game
             """)
         
         i = input('Enter selection: ')
         
         if i == '1':  
-            loop = True
             world.create_character()
+            world.run()
+            loop = False
 
-            while loop:
-                world.display_current_area()
-                loop = False
+        elif i == '2' and os.path.exists(SAVE_PATH):
+            try:
+                world.load_game()
+            except (OSError, ValueError) as e:
+                # The world is untouched by a failed load, so a new character starts from scratch
+                warn('Could not load {}: {}', SAVE_PATH, e)
+                warn('Starting a new game instead.')
+                warn()
+                world.create_character()
+            world.run()
+            loop = False
 
-        elif i == '2':
+        elif i == '3':
             loop = False
             sys.exit
 
@@ -0,0 +1,39 @@
+import argparse
+import os
+import time
+from scripts.content import load_content
+from scripts.balance import Grid, run_grid, write_csv, write_npz, BACKGROUNDS, LEVELS, MAX_TRINKETS
+from scripts.output import flush
+from scripts.simulator import MAX_TURNS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Work out fight odds for every build against every enemy.')
+    parser.add_argument('--out', default='balance.npz', help='.npz for compressed columns, .csv for a flat table')
+    parser.add_argument('--backgrounds', type=int, nargs='+', default=BACKGROUNDS)
+    parser.add_argument('--levels', type=int, nargs='+', default=LEVELS)
+    parser.add_argument('--max-trinkets', type=int, default=MAX_TRINKETS)
+    parser.add_argument('--max-turns', type=int, default=MAX_TURNS)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    out = os.path.abspath(args.out)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    content = load_content()
+    flush()
+
+    grid = Grid(content, args.backgrounds, args.levels, args.max_trinkets)
+    print('Balance matrix: {} cells'.format(grid.size()))
+
+    start = time.perf_counter()
+    tasks, results = run_grid(grid, args.workers, args.max_turns)
+    print('Worked out in {:.1f}s'.format(time.perf_counter() - start))
+
+    if out.endswith('.csv'):
+        write_csv(out, grid, tasks, results)
+    else:
+        write_npz(out, grid, tasks, results)
+    print('Results saved to: {}'.format(out))
+
+
+main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+import numpy as np
+from scripts.content import load_content
+from scripts.output import NullSink, use_sink
+from scripts.scheduler import Roster
+from scripts.world import World
+
+
+CHARACTERS = 100000
+HOURS = 100
+LOOPED = 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Advance many characters through day cycles, batched and one prompt at a time.')
+    parser.add_argument('--characters', type=int, default=CHARACTERS)
+    parser.add_argument('--hours', type=int, default=HOURS)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    use_sink(NullSink())
+    content = load_content()
+    rng = np.random.default_rng(args.seed)
+
+    roster = Roster(content.graph, args.characters)
+    roster.time[:] = rng.integers(0, 12, args.characters)
+    roster.max_health[:] = 10
+    roster.area[:] = rng.integers(0, len(content.area_list), args.characters)
+    roster.camp[:] = content.graph.id('Lastholm')
+
+    start = time.perf_counter()
+    rests = roster.advance(args.hours)
+    batched = time.perf_counter() - start
+
+    worlds = [World(content, i) for i in range(LOOPED)]
+    start = time.perf_counter()
+    for world in worlds:
+        for _ in range(args.hours):
+            world.increment_time(1)
+    looped = (time.perf_counter() - start) / LOOPED * args.characters
+
+    print('{} characters by {} hours, {} rests'.format(args.characters, args.hours, int(rests.sum())))
+    print('{:<10} {:>9.3f}s'.format('batched', batched))
+    print('{:<10} {:>9.3f}s (worked out from {} worlds)'.format('looped', looped, LOOPED))
+    print('{:<10} {:>9.0f}x'.format('speedup', looped / batched))
+
+
+main()
@@ -0,0 +1,65 @@
+import argparse
+import math
+import time
+from scripts.builder import Builder
+from scripts.content import load_content
+from scripts.calculator import Calculator, play_fights
+from scripts.output import NullSink, use_sink, reset_sink
+
+
+BACKGROUNDS = [1, 2, 3, 4]
+AREA = 'Lastholm'
+
+
+def make_player(background):
+    builder = Builder()
+    token = use_sink(NullSink())
+    try:
+        builder.create_character('Tester', background)
+    finally:
+        reset_sink(token)
+    return builder.player
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the fight calculator against real Combat runs.')
+    parser.add_argument('--fights', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    content = load_content()
+    calculator = Calculator()
+
+    print('{:<12} {:<26} {:>9} {:>9} {:>7} {:>9} {:>9} {:>9}'.format(
+        'background', 'enemy', 'exact', 'played', 'sigma', 'turns', 'played', 'ms'))
+    worst = 0.0
+    for background in BACKGROUNDS:
+        for enemy in content.enemy_list:
+            player = make_player(background)
+
+            start = time.perf_counter()
+            exact = calculator.odds(player, enemy)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            played = play_fights(player, enemy, AREA, content.loot, args.fights, args.seed)
+
+            # Distance from the exact win rate in standard errors of the played estimate
+            error = math.sqrt(max(exact.win_rate * (1 - exact.win_rate), 1e-12) / args.fights)
+            sigma = abs(played.win_rate - exact.win_rate) / error
+            worst = max(worst, sigma)
+
+            print('{:<12} {:<26} {:>9.4f} {:>9.4f} {:>7.2f} {:>9} {:>9} {:>9.2f}'.format(
+                background, enemy.name, exact.win_rate, played.win_rate, sigma,
+                format_turns(exact.mean_turns_to_kill()), format_turns(played.mean_turns_to_kill()), elapsed))
+
+    print()
+    print('Largest difference: {:.2f} standard errors'.format(worst))
+
+
+def format_turns(turns):
+    if turns is None:
+        return '-'
+    return '{:.2f}'.format(turns)
+
+
+main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from scripts.agent import Report, play
+from scripts.content import load_content
+from scripts.profiler import Profiler
+
+
+ACTIONS = 20000
+# Each workload is played this many times and the fastest run kept, shared machines are noisy
+REPEATS = 3
+WORKLOADS = [(background, seed) for background, seed in [(1, 1), (2, 2), (3, 3), (4, 4)]]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_baseline.json')
+
+# Higher is better for the rates, lower for everything else
+RATES = ['actions_per_s', 'fights_per_s']
+COSTS = ['p50_us', 'p99_us', 'peak_rss_mb']
+# Times scale with the machine's speed, memory does not
+TIMED = ['actions_per_s', 'fights_per_s', 'p50_us', 'p99_us']
+# The agent plays the same seeds the same way, so these must match the baseline exactly
+COUNTERS = ['actions', 'fights']
+
+CALIBRATION_LOOPS = 200000
+
+
+def calibrate(repeats):
+    # A fixed piece of plain Python, timed next to the game so a slower or busier machine
+    # shows up as a slower calibration rather than as a regression
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        table = {}
+        for i in range(CALIBRATION_LOOPS):
+            table[i & 1023] = table.get(i & 1023, 0) + i
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def read_baseline(path):
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_baseline(path, actions, calibration, results):
+    baseline = {
+        'actions': actions,
+        'calibration_s': calibration,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def change(name, now, then, speed=1.0):
+    # speed is how much faster this run's calibration was than the baseline's
+    if name not in TIMED:
+        speed = 1.0
+    if not then:
+        return 0.0
+    if name in RATES:
+        return now / (then * speed) - 1
+    return then / (now * speed) - 1 if now else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play the full game loop with a scripted agent and compare against the baseline.')
+    parser.add_argument('--actions', type=int, default=ACTIONS, help='answered prompts per workload')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='flag a metric this much worse than the baseline after calibration')
+    parser.add_argument('--strict', action='store_true',
+                        help='fail on flagged timings too, not only on changed counters')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the game\'s hot paths, profiled runs are not compared with the baseline')
+    parser.add_argument('--trace', default=None, help='write a Chrome trace of the timed calls')
+    args = parser.parse_args()
+    if args.update and (args.profile or args.trace):
+        parser.error('a profiled run cannot be saved as the baseline')
+
+    profiler = None
+    if args.profile or args.trace:
+        profiler = Profiler(trace=args.trace is not None).enable()
+    content = load_content()
+    results = {}
+    total = Report('total')
+    calibration = calibrate(args.repeats)
+    for background, seed in WORKLOADS:
+        runs = [play(content, args.actions, background, seed) for _ in range(args.repeats)]
+        report = min(runs, key=lambda run: run.elapsed)
+        total.merge(report)
+        results[report.name] = report.summary()
+    results[total.name] = total.summary()
+    # Taken again afterwards and the faster kept, in case the machine was busy for part of the run
+    calibration = min(calibration, calibrate(args.repeats))
+
+    if profiler is not None:
+        profiler.disable()
+        print('\n'.join(profiler.report()))
+        if args.trace:
+            profiler.write_trace(args.trace)
+            print('Trace saved to: {}'.format(args.trace))
+        print()
+
+    baseline = read_baseline(args.baseline)
+    if baseline is not None and baseline['actions'] != args.actions:
+        print('Baseline was taken with {} actions per workload, not comparing'.format(baseline['actions']))
+        baseline = None
+    if profiler is not None:
+        # The hooks slow every timed call, so the numbers are only good for comparing sections
+        baseline = None
+
+    speed = 1.0
+    if baseline is not None:
+        if baseline.get('calibration_s'):
+            speed = baseline['calibration_s'] / calibration
+            print('Calibration took {:.1f}ms, {:.2f}x the speed of the baseline machine'.format(calibration * 1000, speed))
+        else:
+            print('Baseline has no calibration, comparing raw timings')
+
+    print('{:<14} {:>8} {:>7} {:>11} {:>10} {:>8} {:>8} {:>8}'.format(
+        'workload', 'actions', 'fights', 'actions/s', 'fights/s', 'p50 us', 'p99 us', 'rss MB'))
+    changed = []
+    worse = []
+    for name, summary in results.items():
+        print('{:<14} {:>8} {:>7} {:>11.0f} {:>10.0f} {:>8.1f} {:>8.1f} {:>8.1f}'.format(
+            name, summary['actions'], summary['fights'], summary['actions_per_s'], summary['fights_per_s'],
+            summary['p50_us'], summary['p99_us'], summary['peak_rss_mb']))
+        if baseline is None or name not in baseline['results']:
+            continue
+
+        then = baseline['results'][name]
+        if any(summary[counter] != then[counter] for counter in COUNTERS):
+            # The agent played differently, so the game's behaviour changed and the timings are not comparable
+            print('{:<14} played {} actions and {} fights, the baseline has {} and {}'.format(
+                '', summary['actions'], summary['fights'], then['actions'], then['fights']))
+            changed.append(name)
+            continue
+        changes = [(metric, change(metric, summary[metric], then[metric], speed)) for metric in RATES + COSTS]
+        print('{:<14} {}'.format('', '  '.join('{} {:+.0%}'.format(metric, value) for metric, value in changes)))
+        worse.extend((name, metric, value) for metric, value in changes if value < -args.tolerance)
+
+    if args.update:
+        write_baseline(args.baseline, args.actions, calibration, results)
+        print('Baseline saved to: {}'.format(args.baseline))
+        return
+
+    for name, metric, value in worse:
+        print('{} {} is {:.0%} worse than the baseline'.format(name, metric, -value))
+    if changed:
+        print('{} played differently from the baseline, the game\'s behaviour has changed'.format(', '.join(changed)))
+        sys.exit(1)
+    if worse:
+        if args.strict:
+            sys.exit(1)
+        # Timings still move with other load on the machine, only the counters are a hard gate by default
+        print('Timings are advisory, pass --strict to fail on them')
+
+
+main()
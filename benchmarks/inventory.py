@@ -0,0 +1,65 @@
+import argparse
+import time
+from scripts.content import load_content
+from scripts.dice import Dice
+from scripts.entity import Entity
+from scripts.output import NullSink, use_sink
+
+
+DROPS = 100000
+REPEATS = 1000
+
+
+def time_call(call, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time inventory operations for a player carrying a huge haul.')
+    parser.add_argument('--drops', type=int, default=DROPS)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    use_sink(NullSink())
+    content = load_content()
+    loot = content.loot
+    rng = Dice(args.seed)
+    areas = [location.name for location in content.area_list]
+
+    player = Entity()
+    player.is_player = True
+    inventory = player.inventory
+
+    start = time.perf_counter()
+    for i in range(args.drops):
+        loot.add_item_to_inventory(player, loot.get_drop_by_area(player, areas[i % len(areas)], rng))
+    looted = time.perf_counter() - start
+    print('{} drops in {:.3f}s, {:.2f}us each, {} stacks in the bag'.format(
+        args.drops, looted, looted / args.drops * 1e6, len(inventory.stored_items)))
+
+    def open_and_show():
+        inventory.open_bag()
+        inventory.display_bag()
+
+    wealth = next(item for item in inventory.stored_items if item.type == 'wealth')
+    gear = next(item for item in inventory.stored_items if item.type == 'weapon')
+
+    def equip_and_stow():
+        player.equip_item(gear)
+        inventory.stow_item(gear)
+
+    def sell_and_add():
+        inventory.sell_wealth(wealth)
+        inventory.add_to_stored_items(wealth)
+
+    for name, call in [('open bag', open_and_show), ('equip, stow', equip_and_stow),
+                       ('sell, add', sell_and_add), ('owns', lambda: inventory.owns(gear)),
+                       ('pick item', lambda: inventory.item_at(0))]:
+        print('{:<12} {:>9.2f}us'.format(name, time_call(call, args.repeats) * 1e6))
+
+
+main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from scripts.builder import Builder
+from scripts.loader import Loader
+from scripts.output import NullSink, use_sink
+from benchmarks.tree import make_tree
+
+
+FILES = 50000
+WORKERS = [1, 2, 4, 8, 16]
+
+
+def names(lists):
+    return [[thing.name for thing in things] for things in lists]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sequential and threaded asset loading on a synthetic content tree.')
+    parser.add_argument('--files', type=int, default=FILES)
+    parser.add_argument('--workers', type=int, nargs='+', default=WORKERS)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    use_sink(NullSink())
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.files, random.Random(args.seed))
+        os.chdir(root)
+        try:
+            builder = Builder()
+            start = time.perf_counter()
+            expected = names([builder.build_areas(), builder.build_enemies(), builder.build_items()])
+            sequential = time.perf_counter() - start
+            print('{} files, os cpu count {}'.format(args.files, os.cpu_count()))
+            print('{:<12} {:>8.3f}s'.format('sequential', sequential))
+
+            for workers in args.workers:
+                loader = Loader(workers=workers)
+                loaded = names(loader.load())
+                if loaded != expected:
+                    raise AssertionError('{} workers loaded the content in a different order'.format(workers))
+                print('{:<12} {:>8.3f}s {:>6.2f}x   {}'.format(
+                    '{} workers'.format(workers), loader.timings['total'], sequential / loader.timings['total'],
+                    '  '.join('{} {:.3f}s'.format(phase, seconds) for phase, seconds in loader.timings.items() if phase != 'total')))
+        finally:
+            os.chdir(here)
+
+
+main()
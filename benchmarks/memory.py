@@ -0,0 +1,86 @@
+import argparse
+import gc
+import tracemalloc
+from scripts.entity import Entity
+from scripts.item import Item
+from scripts.location import Location
+from scripts.inventory import Inventory
+
+
+COUNTS = [10000, 1000000]
+
+
+def make_entity(i):
+    entity = Entity()
+    entity.name = 'bone-gnawer.txt'
+    entity.attack = 3
+    entity.defense = 2
+    entity.speed = 3
+    return entity
+
+
+def make_player(i):
+    player = make_entity(i)
+    player.is_player = True
+    player.inventory.income = 0
+    return player
+
+
+def make_item(i):
+    item = Item()
+    item.name = 'rusted shiv.txt'
+    item.type = 'weapon'
+    item.stat_modifiers = {'damage': 1, 'mitigation': 0, 'finesse': 5}
+    item.spawn_location = ['global']
+    return item
+
+
+def make_location(i):
+    location = Location()
+    location.name = 'sewers.txt'
+    location.build_connection('Shadowed residential blocks')
+    location.build_connection('Weeping gardens')
+    location.add_enemy('Sewer-lurker')
+    location.add_enemy('Bone-gnawer')
+    return location
+
+
+def make_inventory(i):
+    return Inventory()
+
+
+FACTORIES = [
+    ('entity', make_entity),
+    ('player', make_player),
+    ('item', make_item),
+    ('location', make_location),
+    ('inventory', make_inventory),
+]
+
+
+def measure(factory, count):
+    holder = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(count):
+        holder[i] = factory(i)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del holder
+    gc.collect()
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes per game object.')
+    parser.add_argument('--counts', type=int, nargs='+', default=COUNTS)
+    args = parser.parse_args()
+
+    print('{:<10} {:>10} {:>14}'.format('object', 'count', 'bytes each'))
+    for name, factory in FACTORIES:
+        for count in args.counts:
+            print('{:<10} {:>10} {:>14.1f}'.format(name, count, measure(factory, count)))
+
+
+main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from scripts.builder import Builder
+from scripts.literal import parse_literal
+from scripts.output import NullSink, use_sink
+from benchmarks.tree import make_tree
+
+
+FILES = 100000
+
+
+def time_lines(parse, lines):
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the asset parser with eval on a synthetic content tree.')
+    parser.add_argument('--files', type=int, default=FILES)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    use_sink(NullSink())
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        lines = make_tree(root, args.files, random.Random(args.seed))
+        print('{} files, {} header lines'.format(args.files, len(lines)))
+
+        assert all(parse_literal(line) == eval(line) for line in lines[:1000])
+        evaluated = time_lines(eval, lines)
+        parsed = time_lines(parse_literal, lines)
+        print('{:<14} {:>9.3f}s {:>9.2f}us per line'.format('eval', evaluated, evaluated / len(lines) * 1e6))
+        print('{:<14} {:>9.3f}s {:>9.2f}us per line'.format('parse_literal', parsed, parsed / len(lines) * 1e6))
+        print('{:<14} {:>9.2f}x'.format('speedup', evaluated / parsed))
+
+        os.chdir(root)
+        try:
+            builder = Builder()
+            start = time.perf_counter()
+            area_list = builder.build_areas()
+            enemy_list = builder.build_enemies()
+            item_list = builder.build_items()
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(here)
+        print('Builder loaded {} locations, {} enemies, {} items in {:.2f}s with {} errors'.format(
+            len(area_list), len(enemy_list), len(item_list), elapsed, len(builder.errors)))
+
+
+main()
@@ -0,0 +1,54 @@
+import argparse
+import random
+import time
+from scripts.content import load_content
+from scripts.output import NullSink, use_sink
+from scripts.world import World
+from scripts import save
+
+
+SIZES = [0, 100, 1000, 100000]
+REPEATS = 200
+
+
+def make_world(content, size, rng):
+    world = World(content)
+    world.player_name = 'Bench'
+    world.player.name = 'Bench'
+    inventory = world.player.inventory
+    for _ in range(size):
+        inventory.add_to_stored_items(rng.choice(content.all_items))
+    return world
+
+
+def time_call(call, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time saving and loading a world with growing inventories.')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    use_sink(NullSink())
+    content = load_content()
+    rng = random.Random(args.seed)
+    target = World(content)
+
+    print('{:>8} {:>10} {:>12} {:>12}'.format('items', 'bytes', 'save us', 'load us'))
+    for size in SIZES:
+        world = make_world(content, size, rng)
+        data = save.dumps(world)
+        save.loads(target, data)
+        assert save.dumps(target) == data
+
+        dumped = time_call(lambda: save.dumps(world), args.repeats)
+        loaded = time_call(lambda: save.loads(target, data), args.repeats)
+        print('{:>8} {:>10} {:>12.1f} {:>12.1f}'.format(size, len(data), dumped * 1e6, loaded * 1e6))
+
+
+main()
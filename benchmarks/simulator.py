@@ -0,0 +1,92 @@
+import argparse
+import math
+import sys
+import time
+import numpy as np
+from scripts.builder import Builder
+from scripts.content import load_content
+from scripts.calculator import play_fights
+from scripts.output import NullSink, use_sink, reset_sink
+from scripts.simulator import Simulator, MAX_TURNS, PLAYER_WIN, ENEMY_WIN
+
+
+BACKGROUNDS = [1, 2, 3, 4]
+AREA = 'Lastholm'
+
+# Both engines roll their own dice, so they are compared as samples of the same fight:
+# win rates within this many standard errors of each other
+WIN_RATE_SIGMA = 4.0
+# and turn distributions passing a two-sample Kolmogorov-Smirnov test at a 0.1% level
+KS_CRITICAL = 1.95
+
+
+def make_player(background):
+    builder = Builder()
+    token = use_sink(NullSink())
+    try:
+        builder.create_character('Tester', background)
+    finally:
+        reset_sink(token)
+    return builder.player
+
+
+def win_rate_sigma(a, b, count):
+    # Two-sample z score of the win rates, both runs play the same number of fights
+    pooled = (a + b) / 2
+    error = math.sqrt(max(pooled * (1 - pooled), 1e-12) * 2 / count)
+    return abs(a - b) / error
+
+
+def turn_distance(a, b):
+    # Largest gap between the two cumulative turn distributions, scaled by the KS critical distance
+    n, m = a.sum(), b.sum()
+    if not n or not m:
+        return 0.0 if n == m else float('inf')
+    gap = np.abs(np.cumsum(a) / n - np.cumsum(b) / m).max()
+    return gap / (KS_CRITICAL * math.sqrt((n + m) / (n * m)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the batch simulator against real Combat runs.')
+    parser.add_argument('--fights', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    content = load_content()
+    simulator = Simulator()
+
+    print('{:<12} {:<26} {:>9} {:>9} {:>7} {:>7} {:>7} {:>9} {:>9}'.format(
+        'background', 'enemy', 'batch', 'combat', 'sigma', 'kills', 'deaths', 'batch ms', 'combat ms'))
+    failed = []
+    for background in BACKGROUNDS:
+        for enemy in content.enemy_list:
+            player = make_player(background)
+
+            start = time.perf_counter()
+            batch = simulator.run(player, enemy, args.fights, args.seed)
+            batch_elapsed = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            played = play_fights(player, enemy, AREA, content.loot, args.fights, args.seed)
+            combat_elapsed = (time.perf_counter() - start) * 1000
+
+            sigma = win_rate_sigma(batch.win_rate, played.win_rate, args.fights)
+            kills = turn_distance(batch.turn_counts(PLAYER_WIN, MAX_TURNS), np.rint(played.wins * args.fights))
+            deaths = turn_distance(batch.turn_counts(ENEMY_WIN, MAX_TURNS), np.rint(played.losses * args.fights))
+            if sigma > WIN_RATE_SIGMA or kills > 1 or deaths > 1:
+                failed.append((background, enemy.name))
+
+            # Turn columns are the KS gap as a share of the critical distance, above 1 fails
+            print('{:<12} {:<26} {:>9.4f} {:>9.4f} {:>7.2f} {:>7.2f} {:>7.2f} {:>9.1f} {:>9.1f}'.format(
+                background, enemy.name, batch.win_rate, played.win_rate, sigma, kills, deaths,
+                batch_elapsed, combat_elapsed))
+
+    print()
+    if failed:
+        for background, name in failed:
+            print('Background {} against {} disagrees with real Combat'.format(background, name))
+        sys.exit(1)
+    print('Every matchup agrees with real Combat')
+
+
+main()
@@ -0,0 +1,45 @@
+import os
+from scripts.builder import LOCATION_PATH, ENEMY_PATH, ITEM_PATH
+
+
+WORDS = ['ash', 'bone', 'cinder', 'dusk', 'ember', 'gloom', 'hollow', 'iron', 'mire', 'rot', 'shade', 'thorn']
+
+
+def make_name(rng, i):
+    return '{} {} {}'.format(rng.choice(WORDS), rng.choice(WORDS), i)
+
+
+def make_tree(root, count, rng):
+    # Roughly the mix of the real assets: mostly items, then locations, then enemies
+    locations = [make_name(rng, i) for i in range(count // 5)]
+    enemies = [make_name(rng, i) for i in range(count // 10)]
+    items = count - len(locations) - len(enemies)
+    lines = []
+
+    os.makedirs(os.path.join(root, LOCATION_PATH, 'bulk'))
+    for name in locations:
+        connections = repr([name.capitalize() for name in rng.sample(locations, 3)])
+        spawns = repr([name.capitalize() for name in rng.sample(enemies, 2)])
+        lines.extend([connections, spawns])
+        with open(os.path.join(root, LOCATION_PATH, 'bulk', name + '.txt'), 'w') as file:
+            file.write('{}\n{}\nA place.\n'.format(connections, spawns))
+
+    os.makedirs(os.path.join(root, ENEMY_PATH, 'bulk'))
+    for name in enemies:
+        with open(os.path.join(root, ENEMY_PATH, 'bulk', name + '.txt'), 'w') as file:
+            file.write('{}\n{}\n{}\n{}\n'.format(rng.randint(1, 9), rng.randint(1, 9), rng.randint(1, 9), rng.randint(1, 5)))
+
+    os.makedirs(os.path.join(root, ITEM_PATH, 'bulk'))
+    for i in range(items):
+        if rng.random() < 0.5:
+            kind = 'weapon'
+            stats = repr({'damage': rng.randint(0, 9), 'mitigation': rng.randint(0, 9), 'finesse': rng.randint(0, 9)})
+        else:
+            kind = 'trinket'
+            stats = repr({'attack': rng.randint(0, 3), 'defense': rng.randint(0, 3), 'speed': rng.randint(0, 3)})
+        spawns = repr([name.capitalize() for name in rng.sample(locations, rng.randint(0, 3))])
+        lines.extend([stats, spawns])
+        with open(os.path.join(root, ITEM_PATH, 'bulk', 'item {}.txt'.format(i)), 'w') as file:
+            file.write('{}\n{}\n{}\nA thing.\n'.format(kind, stats, spawns))
+
+    return lines
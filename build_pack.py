@@ -0,0 +1,24 @@
+import os
+import sys
+from scripts.builder import Builder
+from scripts.pack import Pack
+from scripts.output import flush
+from scripts.registry import UnknownNameError
+
+
+def main():
+    print('Pack Builder')
+    print('')
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pack = Pack()
+    try:
+        pack.compile(Builder())
+    except UnknownNameError as e:
+        flush()
+        print('Cannot build the pack: {}'.format(e))
+        sys.exit(1)
+    flush()
+    print('Pack saved to: {} ({} bytes)'.format(pack.path, os.path.getsize(pack.path)))
+
+
+main()
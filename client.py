@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import sys
+import threading
+from scripts.server import HOST, PORT
+
+
+async def receive(reader):
+    while True:
+        data = await reader.read(4096)
+        if not data:
+            break
+        sys.stdout.write(data.decode('utf-8', errors='replace'))
+        sys.stdout.flush()
+
+
+def send(loop, writer):
+    # Blocking stdin reads live on a daemon thread so they never hold up shutdown
+    for line in sys.stdin:
+        loop.call_soon_threadsafe(writer.write, line.encode('utf-8'))
+
+
+async def connect(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    threading.Thread(target=send, args=(asyncio.get_running_loop(), writer), daemon=True).start()
+    # The session is over once the server hangs up
+    await receive(reader)
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Connect to a MiniQuest server.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    asyncio.run(connect(args.host, args.port))
+
+
+main()
@@ -0,0 +1,40 @@
+import argparse
+import sys
+import time
+from scripts.content import load_content
+from scripts.output import flush
+from scripts.replay import Replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded MiniQuest session from its event log.')
+    parser.add_argument('log', help='event log written by serve.py --log-dir')
+    parser.add_argument('--to', type=int, default=None, help='stop after this many events')
+    parser.add_argument('--show', type=int, default=None, metavar='N',
+                        help='print the last N events before the stopping point as a transcript')
+    args = parser.parse_args()
+
+    content = load_content()
+    try:
+        replay = Replay(content, args.log)
+    except (OSError, ValueError) as e:
+        print('Cannot replay: {}'.format(e))
+        sys.exit(1)
+    stop = len(replay) if args.to is None else args.to
+    shown = 0 if args.show is None else min(args.show, stop)
+
+    start = time.perf_counter()
+    world = replay.world_at(stop - shown)
+    elapsed = time.perf_counter() - start
+    if shown:
+        replay.play(world, stop - shown, stop, transcript=True)
+        flush()
+
+    print('Replayed {} of {} events ({} snapshots) in {:.3f}s'.format(stop, len(replay), len(replay.snapshots), elapsed))
+    player = world.player
+    print('{} in {} on hour {}, level {} with {} health and {} income, state {}'.format(
+        player.name, world.current_area.name, world.time, player.level, player.current_health,
+        player.inventory.income, world.state))
+
+
+main()
@@ -0,0 +1,210 @@
+import resource
+import time
+import numpy as np
+from scripts.dice import Dice
+from scripts.output import NullSink, use_sink, reset_sink
+from scripts.world import (World, NAME, BACKGROUND, AREA, MOVE, FIGHT, BAG, INSPECT, INSPECTED,
+                           EQUIP, SELL, QUIT)
+
+
+# Rest once health drops to this share of the maximum, or once this much wealth is waiting to be sold
+REST_HEALTH = 0.4
+SELL_AT = 3
+
+# The agent's own rolls are kept apart from the world's, so its choices never shift a fight
+AGENT_SEED_OFFSET = 0x5eed
+
+
+class Agent():
+    # Answers every prompt from the world's state rather than its text, the way a player would
+    def __init__(self, world, background=1, seed=None, name='Agent') -> None:
+        self.world = world
+        self.background = background
+        self.name = name
+        self.rng = Dice(None if seed is None else seed + AGENT_SEED_OFFSET)
+        self.quitting = False
+        self.counts = {'fights': 0, 'moves': 0, 'rests': 0, 'sales': 0, 'equips': 0}
+        self.answers = {
+            NAME: self.choose_name,
+            BACKGROUND: self.choose_background,
+            AREA: self.choose_action,
+            MOVE: self.choose_destination,
+            FIGHT: self.attack,
+            BAG: self.choose_bag_action,
+            INSPECT: self.close,
+            INSPECTED: self.close,
+            EQUIP: self.choose_gear,
+            SELL: self.choose_wealth,
+        }
+
+    def answer(self):
+        return self.answers[self.world.state]()
+
+    def choose_name(self):
+        return self.name
+
+    def choose_background(self):
+        return str(self.background)
+
+    def choose_action(self):
+        world = self.world
+        player = world.player
+        if self.quitting:
+            return '9'
+        if player.current_health <= player.max_health * REST_HEALTH:
+            self.counts['rests'] += 1
+            return '3'
+        if world.current_area.name == world.camp and self.wants_bag():
+            return '4'
+        if self.wealth() >= SELL_AT:
+            # Resting is the only way back to camp from some areas
+            self.counts['rests'] += 1
+            return '3'
+        if world.registry.enemy_pool(world.current_area.name) and self.rng.random() < 0.75:
+            self.counts['fights'] += 1
+            return '1'
+        self.counts['moves'] += 1
+        return '2'
+
+    def choose_destination(self):
+        connections = self.world.graph.connections(self.world.current_area.name)
+        if not connections:
+            return '1'
+        return str(int(self.rng.random() * len(connections)) + 1)
+
+    def attack(self):
+        return ''
+
+    def wealth(self):
+        stored = self.world.player.inventory.stored_items
+        return sum(count for item, count in stored.items() if item.type == 'wealth')
+
+    def find(self, wanted):
+        for i, item in enumerate(self.world.player.inventory.stored_items):
+            if wanted(item):
+                return i + 1
+        return None
+
+    def upgrade(self, item):
+        equipped = self.world.player.inventory.equipped_items
+        if item.type == 'weapon':
+            current = equipped['Held']
+        elif item.type == 'armor':
+            current = equipped['Body']
+        elif item.type == 'trinket':
+            return item not in equipped['Trinkets']
+        else:
+            return False
+        if current is None:
+            return True
+        return sum(item.stat_modifiers.values()) > sum(current.stat_modifiers.values())
+
+    def wants_bag(self):
+        return self.wealth() > 0 or self.find(self.upgrade) is not None
+
+    def choose_bag_action(self):
+        if self.wealth() > 0:
+            return '3'
+        if self.find(self.upgrade) is not None:
+            return '2'
+        return '4'
+
+    def choose_wealth(self):
+        self.counts['sales'] += 1
+        return str(self.find(lambda item: item.type == 'wealth'))
+
+    def choose_gear(self):
+        self.counts['equips'] += 1
+        return str(self.find(self.upgrade))
+
+    def close(self):
+        return ''
+
+
+class Report():
+    def __init__(self, name) -> None:
+        self.name = name
+        self.actions = 0
+        # Time spent in the game itself, and the whole run with the agent's thinking included
+        self.elapsed = 0.0
+        self.wall = 0.0
+        self.latencies = np.zeros(0, dtype=np.int64)
+        self.counts = {}
+        self.peak_rss = 0
+
+    def add(self, agent, latencies, wall):
+        self.actions += len(latencies)
+        self.elapsed += int(latencies.sum()) / 1e9
+        self.wall += wall
+        self.latencies = np.concatenate((self.latencies, latencies))
+        for key, value in agent.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        self.peak_rss = max(self.peak_rss, peak_rss())
+
+    def merge(self, other):
+        self.actions += other.actions
+        self.elapsed += other.elapsed
+        self.wall += other.wall
+        self.latencies = np.concatenate((self.latencies, other.latencies))
+        for key, value in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        self.peak_rss = max(self.peak_rss, other.peak_rss)
+
+    def percentile(self, q):
+        if not len(self.latencies):
+            return 0.0
+        return float(np.percentile(self.latencies, q)) / 1000
+
+    def summary(self):
+        elapsed = self.elapsed or float('nan')
+        return {
+            'actions': self.actions,
+            'fights': self.counts.get('fights', 0),
+            'actions_per_s': self.actions / elapsed,
+            'fights_per_s': self.counts.get('fights', 0) / elapsed,
+            'p50_us': self.percentile(50),
+            'p99_us': self.percentile(99),
+            'peak_rss_mb': self.peak_rss / 1024,
+            'wall_s': self.wall,
+        }
+
+
+def peak_rss():
+    # Kilobytes on Linux, which is what the baselines were taken on
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def play(content, actions, background=1, seed=None, report=None):
+    # Drives the real game loop for a number of answered prompts, then quits from the location menu
+    if report is None:
+        report = Report('background {}'.format(background))
+    world = World(content, seed)
+    agent = Agent(world, background, seed)
+    # Room for finishing a fight and closing the bag once the actions are used up
+    latencies = np.zeros(actions + 1024, dtype=np.int64)
+    clock = time.perf_counter_ns
+
+    token = use_sink(NullSink())
+    try:
+        played = 0
+        start = time.perf_counter()
+        while world.state != QUIT:
+            if played == actions:
+                agent.quitting = True
+            elif played == len(latencies):
+                break
+            # Only the game's own work is timed, not the agent making up its mind
+            began = clock()
+            world.show()
+            shown = clock()
+            line = agent.answer()
+            answered = clock()
+            world.state = world.step(line)
+            latencies[played] = clock() - answered + shown - began
+            played += 1
+        wall = time.perf_counter() - start
+    finally:
+        reset_sink(token)
+
+    report.add(agent, latencies[:played], wall)
+    return report
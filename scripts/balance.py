@@ -0,0 +1,185 @@
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scripts.builder import Builder
+from scripts.calculator import Calculator
+from scripts.enemy import EnemyTemplate
+from scripts.item import Item
+from scripts.output import NullSink, use_sink
+from scripts.simulator import Fighter, MAX_TURNS
+
+
+BACKGROUNDS = [1, 2, 3, 4]
+LEVELS = [1, 2, 3, 4, 5]
+MAX_TRINKETS = 2
+
+COLUMNS = ['win_rate', 'loss_rate', 'unresolved_rate', 'mean_turns_to_kill', 'mean_turns_to_die']
+
+# Set once in each worker process by start_worker
+_worker = None
+
+
+def enemy_record(enemy):
+    return (enemy.name, enemy.level, enemy.attack, enemy.defense, enemy.speed)
+
+
+def item_record(item):
+    return (item.name, item.type, item.stat_modifiers)
+
+
+def make_item(record):
+    item = Item()
+    item.name, item.type, item.stat_modifiers = record
+    return item
+
+
+class Grid():
+    def __init__(self, content, backgrounds=BACKGROUNDS, levels=LEVELS, max_trinkets=MAX_TRINKETS) -> None:
+        self.backgrounds = backgrounds
+        self.levels = levels
+        self.enemies = [enemy_record(e) for e in content.enemy_list]
+
+        # Every slot can also be left empty
+        self.weapons = [None] + [item_record(i) for i in content.all_items if i.type == 'weapon']
+        self.armors = [None] + [item_record(i) for i in content.all_items if i.type == 'armor']
+        self.trinkets = [item_record(i) for i in content.all_items if i.type == 'trinket']
+        self.trinket_sets = []
+        for count in range(min(max_trinkets, len(self.trinkets)) + 1):
+            self.trinket_sets.extend(itertools.combinations(range(len(self.trinkets)), count))
+
+    def tasks(self):
+        # One task per background, level and weapon, each covering every armor and trinket set
+        for background in self.backgrounds:
+            for level in self.levels:
+                for weapon in range(len(self.weapons)):
+                    yield (background, level, weapon)
+
+    def builds_per_task(self):
+        return len(self.armors) * len(self.trinket_sets)
+
+    def size(self):
+        tasks = len(self.backgrounds) * len(self.levels) * len(self.weapons)
+        return tasks * self.builds_per_task() * len(self.enemies)
+
+
+class Worker():
+    def __init__(self, grid, max_turns) -> None:
+        self.grid = grid
+        self.enemies = [EnemyTemplate(*record) for record in grid.enemies]
+        self.weapons = [make_item(r) if r is not None else None for r in grid.weapons]
+        self.armors = [make_item(r) if r is not None else None for r in grid.armors]
+        self.trinkets = [make_item(r) for r in grid.trinkets]
+        self.calculator = Calculator(max_turns)
+
+        # Many builds share the same combat numbers, their odds are only worked out once
+        self.cache = {}
+
+    def make_player(self, background, level, gear):
+        builder = Builder()
+        builder.create_character('Tester', background)
+        player = builder.get_player()
+        player.is_player = True
+        player.level = level
+        for item in gear:
+            player.inventory.add_to_stored_items(item)
+            player.equip_item(item)
+        player.update_stats()
+        player.reset_health()
+        return player
+
+    def odds(self, player):
+        fighter = Fighter(player)
+        key = (player.speed, fighter.health, fighter.low, fighter.high,
+               fighter.crit_modifier, fighter.crit_bonus, fighter.reduction)
+        row = self.cache.get(key)
+        if row is None:
+            row = np.empty((len(self.enemies), len(COLUMNS)), dtype=np.float32)
+            for i, enemy in enumerate(self.enemies):
+                summary = self.calculator.odds(player, enemy).summary()
+                row[i] = [np.nan if summary[c] is None else summary[c] for c in COLUMNS]
+            self.cache[key] = row
+        return row
+
+    def run(self, task):
+        background, level, weapon = task
+        results = np.empty((self.grid.builds_per_task(), len(self.enemies), len(COLUMNS)), dtype=np.float32)
+        i = 0
+        for armor in self.armors:
+            for trinket_set in self.grid.trinket_sets:
+                gear = [item for item in [self.weapons[weapon], armor] if item is not None]
+                gear.extend(self.trinkets[t] for t in trinket_set)
+                results[i] = self.odds(self.make_player(background, level, gear))
+                i += 1
+        return results
+
+
+def start_worker(grid, max_turns):
+    # Content arrives once per process, tasks only carry a few numbers
+    global _worker
+    use_sink(NullSink())
+    _worker = Worker(grid, max_turns)
+
+
+def run_task(task):
+    return _worker.run(task)
+
+
+def run_grid(grid, workers=None, max_turns=MAX_TURNS):
+    tasks = list(grid.tasks())
+    with ProcessPoolExecutor(max_workers=workers, initializer=start_worker, initargs=(grid, max_turns)) as executor:
+        chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(run_task, tasks, chunksize=chunksize))
+    return tasks, results
+
+
+def label_columns(grid, tasks):
+    # Cell labels in the same order as the result rows, as indices into the name tables
+    per_task = grid.builds_per_task() * len(grid.enemies)
+    armors = np.repeat(np.arange(len(grid.armors)), len(grid.trinket_sets) * len(grid.enemies))
+    trinket_sets = np.tile(np.repeat(np.arange(len(grid.trinket_sets)), len(grid.enemies)), len(grid.armors))
+    enemies = np.tile(np.arange(len(grid.enemies)), grid.builds_per_task())
+
+    task_array = np.array(tasks, dtype=np.int32).reshape(-1, 3)
+    return {
+        'background': np.repeat(task_array[:, 0], per_task).astype(np.int8),
+        'level': np.repeat(task_array[:, 1], per_task).astype(np.int16),
+        'weapon': np.repeat(task_array[:, 2], per_task).astype(np.int16),
+        'armor': np.tile(armors, len(tasks)).astype(np.int16),
+        'trinkets': np.tile(trinket_sets, len(tasks)).astype(np.int32),
+        'enemy': np.tile(enemies, len(tasks)).astype(np.int16),
+    }
+
+
+def names(grid):
+    return {
+        'weapon_names': np.array(['' if r is None else r[0] for r in grid.weapons]),
+        'armor_names': np.array(['' if r is None else r[0] for r in grid.armors]),
+        'trinket_names': np.array(['+'.join(grid.trinkets[t][0] for t in s) for s in grid.trinket_sets]),
+        'enemy_names': np.array([r[0] for r in grid.enemies]),
+    }
+
+
+def write_npz(path, grid, tasks, results):
+    values = np.concatenate(results).reshape(-1, len(COLUMNS))
+    columns = label_columns(grid, tasks)
+    for i, column in enumerate(COLUMNS):
+        columns[column] = values[:, i]
+    columns.update(names(grid))
+    np.savez_compressed(path, **columns)
+
+
+def write_csv(path, grid, tasks, results):
+    tables = names(grid)
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['background', 'level', 'weapon', 'armor', 'trinkets', 'enemy'] + COLUMNS)
+        for (background, level, weapon), result in zip(tasks, results):
+            i = 0
+            for armor in tables['armor_names']:
+                for trinkets in tables['trinket_names']:
+                    for e, enemy in enumerate(tables['enemy_names']):
+                        row = ['' if np.isnan(v) else '{:.6g}'.format(v) for v in result[i, e]]
+                        writer.writerow([background, level, tables['weapon_names'][weapon], armor, trinkets, enemy] + row)
+                    i += 1
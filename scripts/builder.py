@@ -1,7 +1,11 @@
 import os
 from scripts.location import Location
 from scripts.entity import Entity
+from scripts.enemy import EnemyTemplate
 from scripts.item import Item
+from scripts.description import FileDescription
+from scripts.literal import parse_literal
+from scripts.output import say, warn
 
 
 LOCATION_PATH = 'assets/locations/'
@@ -13,15 +17,18 @@ class Builder():
     def __init__(self) -> None:
         self.player = Entity()
 
-    def create_character(self):
-        self.player.name = input('What is your name? ')
-        print()
-        print('1. Quarryman')
-        print('2. Loom-runner')
-        print('3. Waller')
-        print('4. Pest-culler')
-        print()
-        background = int(input('What is your background? '))
+        # Files that could not be built, as (path, message), for the validator to report
+        self.errors = []
+
+    def display_backgrounds(self):
+        say('1. Quarryman')
+        say('2. Loom-runner')
+        say('3. Waller')
+        say('4. Pest-culler')
+        say()
+
+    def create_character(self, name, background):
+        self.player.name = name
         if background == 1:
             self.player.attack = 5
             self.player.defense = 3
@@ -49,170 +56,164 @@ class Builder():
     def get_player(self):
         return self.player
 
-    def build_areas(self):
-        area_list = []
-        for dirpath, _, filenames in os.walk(LOCATION_PATH):
-            for filename in filenames:
+    def list_files(self, path):
+        # Sorted so content loads in the same order on every filesystem, seeded games and replays depend on it
+        files = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
                 # print('Attempting to walk through {}'.format(filename))
                 if filename.endswith(".txt"):
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        with open(filepath, "r") as file:
-                            description = []
-                            connections = []
-                            enemies = []
-                            for i, line in enumerate(file):
-                                if i == 0:
-                                    connection_line = line.strip()
-                                    # print(connection_line)
-                                    connections = eval(connection_line)
-                                elif i == 1:
-                                    enemy_line = line.strip()
-                                    # print(enemy_line)
-                                    enemies = eval(enemy_line)
-                                else:
-                                    description.append(line.strip())
-                                    # print('Reading description {}'.format(description))
-                            
-                            location = Location()
-                            location.name = filename
-                            # print('Built location {}'.format(location.name))
-                            
-                            location.description = ''
-                            location.description = description
-                            # print('Set description {}'.format(location.description))
-                            
-
-                            for i in connections:
-                                location.build_connection(i)
-                                # print('Built connection to {}'.format(i))
-                            
-                            for e in enemies:
-                                location.add_enemy(e)
-
-                            area_list.append(location)
-                    except Exception as e:
-                        print(f"Error reading file {filepath}: {e}")
-
-        return area_list
+                    files.append((os.path.join(dirpath, filename), filename))
+        return files
+
+    def report_error(self, filepath, e):
+        warn("Error reading file {}: {}", filepath, e)
+        self.errors.append((filepath, '{}: {}'.format(e.__class__.__name__, e)))
+
+    def report_problems(self, filepath, problems):
+        for problem in problems:
+            warn('Did not find stats in {}', os.path.basename(filepath))
+            self.errors.append((filepath, problem))
+
+    def build_all(self, path, build):
+        built = []
+        for filepath, filename in self.list_files(path):
+            try:
+                problems = []
+                built.append(build(filepath, filename, problems))
+                self.report_problems(filepath, problems)
+            except Exception as e:
+                self.report_error(filepath, e)
+
+        return built
+
+    def build_areas(self):
+        return self.build_all(LOCATION_PATH, self.build_area)
+
+    def build_area(self, filepath, filename, problems):
+        with open(filepath, "r") as file:
+            connections = []
+            enemies = []
+            connection_line = file.readline()
+            if connection_line:
+                # print(connection_line)
+                connections = parse_literal(connection_line.strip(), line=1)
+            enemy_line = file.readline()
+            if enemy_line:
+                # print(enemy_line)
+                enemies = parse_literal(enemy_line.strip(), line=2)
+            # The description is read on demand from here
+            description_offset = file.tell()
+            
+            location = Location()
+            location.name = filename
+            # print('Built location {}'.format(location.name))
+            
+            location.description_source = FileDescription(filepath, description_offset)
+            # print('Set description {}'.format(location.description))
+            
+
+            for i in connections:
+                location.build_connection(i)
+                # print('Built connection to {}'.format(i))
+            
+            for e in enemies:
+                location.add_enemy(e)
+
+        return location
     
     def build_enemies(self):
-        enemy_list = []
-        for dirpath, _, filenames in os.walk(ENEMY_PATH):
-            for filename in filenames:
-                # print('Attempting to walk through {}'.format(filename))
-                if filename.endswith(".txt"):
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        with open(filepath, "r") as file:
-                            name = filename
-                            attack = 1
-                            defense = 1
-                            speed = 1
-                            level = 1
-                            for i, line in enumerate(file):
-                                if i == 0:
-                                    attack_line = line.strip()
-                                    # print('Setting {} Attack {}'.format(name, attack_line))
-                                    attack = int(attack_line)
-                                elif i == 1:
-                                    defense_line = line.strip()
-                                    # print('Setting {} Defense {}'.format(name, defense_line))
-                                    defense = int(defense_line)
-                                elif i == 2:
-                                    speed_line = line.strip()
-                                    # print('Setting {} Speed {}'.format(name, speed_line))
-                                    speed = int(speed_line)
-                                elif i == 3:
-                                    level_line = line.strip()
-                                    # print('Setting {} Level {}'.format(name, level_line))
-                                    level = int(level_line)
-                                else:
-                                    print('Did not find stats in {}'.format(filename))
-                                    # description.append(line.strip())
-                                    # print('Reading description {}'.format(description))
-                            
-                            enemy = Entity()
-                            enemy.name = name
-                            enemy.level = level
-                            # print('Built enemy {} level {}'.format(enemy.name, enemy.level))
-                            
-                            enemy.attack = attack
-                            enemy.defense = defense
-                            enemy.speed = speed
-                            # print('Set stats A:{} D:{} S:{}\n'.format(enemy.attack, enemy.defense, enemy.speed))
-                    
-                            enemy_list.append(enemy)
-                    except Exception as e:
-                        print(f"Error reading file {filepath}: {e}")
-        
-        return enemy_list
+        return self.build_all(ENEMY_PATH, self.build_enemy)
+
+    def build_enemy(self, filepath, filename, problems):
+        with open(filepath, "r") as file:
+            name = filename
+            attack = 1
+            defense = 1
+            speed = 1
+            level = 1
+            for i, line in enumerate(file):
+                if i == 0:
+                    attack_line = line.strip()
+                    # print('Setting {} Attack {}'.format(name, attack_line))
+                    attack = int(attack_line)
+                elif i == 1:
+                    defense_line = line.strip()
+                    # print('Setting {} Defense {}'.format(name, defense_line))
+                    defense = int(defense_line)
+                elif i == 2:
+                    speed_line = line.strip()
+                    # print('Setting {} Speed {}'.format(name, speed_line))
+                    speed = int(speed_line)
+                elif i == 3:
+                    level_line = line.strip()
+                    # print('Setting {} Level {}'.format(name, level_line))
+                    level = int(level_line)
+                else:
+                    problems.append('unexpected line {}: {}'.format(i + 1, line.strip()))
+                    # description.append(line.strip())
+                    # print('Reading description {}'.format(description))
+            
+            enemy = EnemyTemplate(name, level, attack, defense, speed)
+            # print('Built enemy {} level {}'.format(enemy.name, enemy.level))
+            # print('Set stats A:{} D:{} S:{}\n'.format(enemy.attack, enemy.defense, enemy.speed))
+    
+        return enemy
     
     def build_items(self):
-        item_list = []
-        for dirpath, _, filenames in os.walk(ITEM_PATH):
-            for filename in filenames:
-                # print('Attempting to walk through {}'.format(filename))
-                if filename.endswith(".txt"):
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        with open(filepath, "r") as file:
-                            name = filename
-                            type = 'None'
-                            description = []
-                            stat_modifiers = {}
-                            location = []
-                            worth = 0
-                            for i, line in enumerate(file):
-                                if i == 0:
-                                    type_line = line.strip()
-                                    # print('Setting {} type to {}'.format(name, type_line))
-                                    type = type_line
-
-                                elif i == 1:
-                                    stat_line = line.strip()
-                                    # print('Setting stat modifiers as {}'.format(stat_line))
-
-                                    if type in ['weapon', 'armor', 'crafting', 'trinket']:
-                                        stat_modifiers = eval(stat_line)
-                                    
-                                    elif type == 'wealth':
-                                        worth = int(stat_line)
-
-                                elif i == 2:
-                                    location_line = line.strip()
-                                    check = eval(location_line)
-                                    if not check:
-                                        location = ['global']
-                                    else:
-                                        location = check
-                                    # print('Setting the drop locations as {}'.format(location))
-                                else:
-                                    description.append(line.strip())
-                                    # print('Setting {} description'.format(name))
-                            
-                        item = Item()
-                        item.name = name
-                        item.type = type
-                        # print('Built item {} type {}'.format(item.name, item.type))
-                        
-                        item.description = description
-                        # print('Set description as {}'.format(item.description))
-
-                        item.spawn_location = location
-                        # print('Added to {}'.format(item.spawn_location))
-                        
-                        if type == 'wealth':
-                            item.worth = worth
-                            # print('Set worth {}'.format(item.worth))
-                        else:
-                            item.stat_modifiers = stat_modifiers
-                            # print('Set stat modifiers {}'.format(item.stat_modifiers))
-                        
-                        item_list.append(item)
-                        # print('Item successfully appended to the item list!\n')
-                    
-                    except Exception as e:
-                        print(f"Error reading file {filepath}: {e}\n")
+        return self.build_all(ITEM_PATH, self.build_item)
+
+    def build_item(self, filepath, filename, problems):
+        with open(filepath, "r") as file:
+            name = filename
+            type = 'None'
+            stat_modifiers = {}
+            location = []
+            worth = 0
+            type_line = file.readline()
+            if type_line:
+                # print('Setting {} type to {}'.format(name, type_line))
+                type = type_line.strip()
+
+            stat_line = file.readline()
+            if stat_line:
+                stat_line = stat_line.strip()
+                # print('Setting stat modifiers as {}'.format(stat_line))
+
+                if type in ['weapon', 'armor', 'crafting', 'trinket']:
+                    stat_modifiers = parse_literal(stat_line, line=2)
+                
+                elif type == 'wealth':
+                    worth = int(stat_line)
+
+            location_line = file.readline()
+            if location_line:
+                check = parse_literal(location_line.strip(), line=3)
+                if not check:
+                    location = ['global']
+                else:
+                    location = check
+                # print('Setting the drop locations as {}'.format(location))
+            # The description is read on demand from here
+            description_offset = file.tell()
+            
+        item = Item()
+        item.name = name
+        item.type = type
+        # print('Built item {} type {}'.format(item.name, item.type))
+        
+        item.description_source = FileDescription(filepath, description_offset, skip_blank=True)
+        # print('Set description as {}'.format(item.description))
+
+        item.spawn_location = location
+        # print('Added to {}'.format(item.spawn_location))
+        
+        if type == 'wealth':
+            item.worth = worth
+            # print('Set worth {}'.format(item.worth))
+        else:
+            item.stat_modifiers = stat_modifiers
+            # print('Set stat modifiers {}'.format(item.stat_modifiers))
         
-        return item_list
\ No newline at end of file
+        return item
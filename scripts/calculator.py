@@ -0,0 +1,171 @@
+import numpy as np
+from scripts.entity import CRIT_CHANCE
+from scripts.simulator import Fighter, MAX_TURNS
+from scripts.combat import Combat
+from scripts.dice import Dice
+from scripts.output import NullSink, use_sink, reset_sink
+
+
+# Once the defender is this close to certainly dead the remaining swings change nothing
+SETTLED = 1e-15
+
+
+def hit_distribution(attacker, defender):
+    # Chance of each amount of damage one swing deals after the defender's reduction
+    rolls = np.arange(attacker.low, attacker.high + 1)
+    crit_rolls = min(max(CRIT_CHANCE + attacker.crit_modifier, 0), 100)
+    crit = crit_rolls / 100
+
+    normal = np.maximum(rolls - defender.reduction, 0)
+    crits = np.maximum(rolls * 2 + attacker.crit_bonus - defender.reduction, 0)
+
+    size = max(normal.max(), crits.max()) + 1
+    chances = np.zeros(size)
+    np.add.at(chances, normal, (1 - crit) / len(rolls))
+    np.add.at(chances, crits, crit / len(rolls))
+    return chances
+
+
+def kill_chances(hits, health, swings):
+    # kills[k] is the chance the defender is dead after k + 1 swings,
+    # any damage past the defender's health is folded into the last cell
+    damage = np.zeros(health + 1)
+    damage[0] = 1.0
+    kills = np.zeros(swings)
+    for k in range(swings):
+        spread = np.convolve(damage[:health], hits)
+        dead = damage[health] + spread[health:].sum()
+        damage[:health] = spread[:health]
+        damage[health] = dead
+        kills[k] = dead
+        if 1.0 - dead < SETTLED:
+            kills[k:] = dead
+            break
+    return kills
+
+
+class FightOdds():
+    def __init__(self, player_name, enemy_name, wins, losses) -> None:
+        self.player_name = player_name
+        self.enemy_name = enemy_name
+
+        # Chance the fight ends on each turn, turn 1 at index 0
+        self.wins = wins
+        self.losses = losses
+
+    @property
+    def win_rate(self):
+        return float(self.wins.sum())
+
+    @property
+    def loss_rate(self):
+        return float(self.losses.sum())
+
+    @property
+    def unresolved_rate(self):
+        return max(1.0 - self.win_rate - self.loss_rate, 0.0)
+
+    def mean_turns(self, chances):
+        total = chances.sum()
+        if total <= 0:
+            return None
+        return float((chances * np.arange(1, len(chances) + 1)).sum() / total)
+
+    def mean_turns_to_kill(self):
+        return self.mean_turns(self.wins)
+
+    def mean_turns_to_die(self):
+        return self.mean_turns(self.losses)
+
+    def summary(self):
+        return {
+            'player': self.player_name,
+            'enemy': self.enemy_name,
+            'win_rate': self.win_rate,
+            'loss_rate': self.loss_rate,
+            'unresolved_rate': self.unresolved_rate,
+            'mean_turns_to_kill': self.mean_turns_to_kill(),
+            'mean_turns_to_die': self.mean_turns_to_die(),
+        }
+
+
+class Calculator():
+    def __init__(self, max_turns=MAX_TURNS) -> None:
+        self.max_turns = max_turns
+
+        # Kill curves by attacker and defender numbers, sweeps reuse most of them
+        self.kills = {}
+
+    def order(self, player, enemy):
+        # Mirrors Combat.add_combatant with the player added first
+        if enemy.speed > player.speed:
+            return Fighter(enemy), Fighter(player), False
+        return Fighter(player), Fighter(enemy), True
+
+    def odds(self, player, enemy):
+        first, second, player_first = self.order(player, enemy)
+
+        # Each side's hits are independent, so each side's chance of having
+        # killed by its k-th swing is enough to work out who lands the first kill
+        first_swings = (self.max_turns + 1) // 2
+        second_swings = self.max_turns // 2
+        first_kills = self.kill_chances(first, second, first_swings)
+        second_kills = self.kill_chances(second, first, second_swings)
+
+        first_new = np.diff(first_kills, prepend=0.0)
+        second_new = np.diff(second_kills, prepend=0.0)
+        second_before = np.concatenate(([0.0], second_kills))[:first_swings]
+
+        # The first fighter swings on odd turns, the second on even ones
+        first_wins = np.zeros(self.max_turns)
+        second_wins = np.zeros(self.max_turns)
+        first_wins[0::2] = first_new * (1 - second_before)
+        second_wins[1::2] = second_new * (1 - first_kills[:second_swings])
+
+        if player_first:
+            return FightOdds(player.name, enemy.name, first_wins, second_wins)
+        return FightOdds(player.name, enemy.name, second_wins, first_wins)
+
+    def kill_chances(self, attacker, defender, swings):
+        key = (attacker.low, attacker.high, attacker.crit_modifier, attacker.crit_bonus,
+               defender.reduction, defender.health, swings)
+        kills = self.kills.get(key)
+        if kills is None:
+            kills = kill_chances(hit_distribution(attacker, defender), defender.health, swings)
+            self.kills[key] = kills
+        return kills
+
+    def sweep(self, player, enemies):
+        results = {}
+        for enemy in enemies:
+            results[enemy.name] = self.odds(player, enemy)
+        return results
+
+
+def play_fights(player, template, area, loot, count, seed=None, max_turns=MAX_TURNS):
+    # Runs the real Combat with text switched off, for checking the calculator against
+    rng = Dice(seed)
+    wins = np.zeros(max_turns)
+    losses = np.zeros(max_turns)
+    token = use_sink(NullSink())
+    try:
+        for _ in range(count):
+            player.reset_health()
+            enemy = template.spawn()
+
+            combat = Combat(area, loot, rng)
+            combat.add_combatant(player)
+            combat.add_combatant(enemy)
+            combat.start_combat()
+            while combat.run and combat.turns < max_turns:
+                combat.player_attack()
+
+            if combat.run or combat.turns > max_turns:
+                continue
+            if player.is_dead():
+                losses[combat.turns - 1] += 1
+            else:
+                wins[combat.turns - 1] += 1
+    finally:
+        reset_sink(token)
+    return FightOdds(player.name, template.name, wins / count, losses / count)
@@ -1,12 +1,17 @@
 from scripts.loot import Loot
+from scripts.output import say
 
 
 class Combat():
-    def __init__(self, area, loot):
+    def __init__(self, area, loot, rng):
         self.combatant_list = []
         self.loot = loot
+        self.rng = rng
         self.area = area
         self.run = True
+        self.attacker = None
+        self.defender = None
+        self.turns = 0
 
     def add_combatant(self, fighter):
         try:
@@ -18,52 +23,54 @@ class Combat():
             self.combatant_list.append(fighter)
 
     def print_combatants(self):
-        print('{} acts first with base speed {}! {} acts second with base speed {}!'.format(
+        say('{} acts first with base speed {}! {} acts second with base speed {}!',
             self.combatant_list[0].name, 
             self.combatant_list[0].speed, 
             self.combatant_list[1].name, 
-            self.combatant_list[1].speed))
+            self.combatant_list[1].speed)
         
     def start_combat(self):
-        attacker = self.combatant_list[0]
-        defender = self.combatant_list[1]
+        self.attacker = self.combatant_list[0]
+        self.defender = self.combatant_list[1]
+        self.advance()
 
-        while self.run:
-            if attacker.is_player:
-                self.player_turn(attacker, defender)
+    def advance(self):
+        # Enemies act on their own, the fight waits whenever it is the player's turn
+        while self.run and not self.attacker.is_player:
+            self.enemy_turn(self.attacker, self.defender)
 
-                attacker, defender = defender, attacker
+            self.attacker, self.defender = self.defender, self.attacker
 
-            else:
-                self.enemy_turn(attacker, defender)
+    def player_attack(self):
+        self.player_turn(self.attacker, self.defender)
 
-                attacker, defender = defender, attacker
+        self.attacker, self.defender = self.defender, self.attacker
+        self.advance()
 
     def player_turn(self, attacker, defender):
-        print('It\'s your turn!\n')
-        input('Press enter to attack.\n')
-
-        damage = attacker.roll_attack()
-        print('You deal {} damage!\n'.format(damage))
+        self.turns += 1
+        damage = attacker.roll_attack(self.rng)
+        say('You deal {} damage!\n', damage)
         
         defender.take_damage(damage)
-        print('{} has {} health.\n'.format(defender.name, defender.current_health))
+        say('{} has {} health.\n', defender.name, defender.current_health)
 
         if self.check_death(defender):
-            print('You have defeated {}!\n'.format(defender.name))
+            say('You have defeated {}!\n', defender.name)
             self.generate_loot(attacker)
             self.run = False
 
     def enemy_turn(self, attacker, defender):
-        print('You are being attacked!\n')
-        damage = attacker.roll_attack()
-        print('You have been dealt {} damage!\n'.format(damage))
+        self.turns += 1
+        say('You are being attacked!\n')
+        damage = attacker.roll_attack(self.rng)
+        say('You have been dealt {} damage!\n', damage)
 
         defender.take_damage(damage)
-        print('You have {} health left.\n'.format(defender.current_health))
+        say('You have {} health left.\n', defender.current_health)
 
         if self.check_death(defender):
-            print('You have died!\n')
+            say('You have died!\n')
             self.run = False
 
     def update_fighters(self):
@@ -74,7 +81,7 @@ class Combat():
     
     def generate_loot(self, player):
         # loot.set_items(player.inventory.get_items())
-        drop = self.loot.get_drop_by_area(player, self.area)
-        print('As the creature lays dead you find a {}!'.format(drop.name))
+        drop = self.loot.get_drop_by_area(player, self.area, self.rng)
+        say('As the creature lays dead you find a {}!', drop.name)
         self.loot.add_item_to_inventory(player, drop)
         
\ No newline at end of file
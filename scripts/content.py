@@ -0,0 +1,72 @@
+from scripts.builder import Builder
+from scripts.pack import Pack
+from scripts.registry import Registry
+from scripts.loot import Loot
+from scripts.graph import WorldGraph
+from scripts.loader import Loader
+from scripts.save import IdTable
+from scripts.sources import source_manifest, manifest_digest
+
+
+class Content():
+    def __init__(self, area_list, enemy_list, all_items, strict=True) -> None:
+        self.area_list = area_list
+        self.enemy_list = enemy_list
+        self.all_items = all_items
+        self.registry = Registry(area_list, enemy_list, all_items, strict)
+        self.graph = WorldGraph(area_list)
+
+        self.loot = Loot()
+        self.loot.set_items(all_items)
+        self.loot.set_registry(self.registry)
+
+        # Save ids are only needed once a game is saved or loaded
+        self.ids = None
+        # The manifest of the files this content was built from, when the pack already had it
+        self.sources = None
+        self.source_digest = None
+
+    def id_table(self):
+        if self.ids is None:
+            self.ids = IdTable(self)
+        return self.ids
+
+    def digest(self):
+        # Identifies the asset files by path and contents, event logs only replay against the same ones
+        if self.source_digest is None:
+            sources = self.sources if self.sources is not None else source_manifest()
+            self.source_digest = manifest_digest(sources)
+        return self.source_digest
+
+    def forget_sources(self):
+        # Called after a reload changes the content, the files are hashed again when next asked
+        self.sources = None
+        self.source_digest = None
+
+    def rebuild(self):
+        # Every index is rebuilt in place, worlds sharing this content keep their references
+        self.registry.rebuild(self.area_list, self.enemy_list, self.all_items)
+        self.loot.build_tables()
+        self.graph.build(self.area_list)
+        self.ids = None
+
+
+def load_content(builder=None, strict=True):
+    # Unknown names raise UnknownNameError unless strict is off, which only warns and skips them
+    if builder is None:
+        builder = Builder()
+
+    pack = Pack()
+    if not pack.exists():
+        return Content(*Loader(builder).load(), strict=strict)
+
+    if pack.is_stale():
+        pack.compile(builder, strict)
+    try:
+        content = Content(*pack.load(), strict=strict)
+    except ValueError:
+        # Packs written by an older version are rebuilt in place
+        pack.compile(builder, strict)
+        content = Content(*pack.load(), strict=strict)
+    content.sources = pack.manifest
+    return content
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+
+# Upper bound on the characters of description text held in memory at once
+CACHE_SIZE = 256 * 1024
+
+
+def format_lines(lines, skip_blank=False):
+    text = ''
+    for line in lines:
+        line = line.strip()
+        if line == '' and skip_blank:
+            continue
+        text += line + '\n'
+    return text
+
+
+class FileDescription():
+    __slots__ = ('path', 'offset', 'skip_blank')
+
+    def __init__(self, path, offset, skip_blank=False) -> None:
+        self.path = path
+        self.offset = offset
+        self.skip_blank = skip_blank
+
+    def key(self):
+        return (self.path, self.offset)
+
+    def read(self):
+        # The offset is a tell() from the text-mode reader in Builder, so reopen the same way
+        with open(self.path, 'r', errors='replace') as file:
+            file.seek(self.offset)
+            return format_lines(file, self.skip_blank)
+
+
+class PackDescription():
+    __slots__ = ('data', 'offset', 'length')
+
+    def __init__(self, data, offset, length) -> None:
+        # data is the pack's mmap, which stays valid even if the pack is rebuilt on disk
+        self.data = data
+        self.offset = offset
+        self.length = length
+
+    def key(self):
+        return (self.data, self.offset)
+
+    def read(self):
+        return self.data[self.offset:self.offset + self.length].decode('utf-8')
+
+
+class DescriptionCache():
+    def __init__(self, max_size=CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def get(self, source):
+        key = source.key()
+        text = self.entries.get(key)
+        if text is not None:
+            self.entries.move_to_end(key)
+            return text
+
+        text = source.read()
+        self.entries[key] = text
+        self.size += len(text)
+
+        # Always keep the newest entry, even when it is larger than the cap on its own
+        while self.size > self.max_size and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+        return text
+
+    def forget(self, source):
+        text = self.entries.pop(source.key(), None)
+        if text is not None:
+            self.size -= len(text)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+DESCRIPTIONS = DescriptionCache()
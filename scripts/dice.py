@@ -0,0 +1,96 @@
+import os
+import struct
+from random import Random
+
+
+# How many rolls are drawn at a time for each range
+BLOCK_SIZE = 256
+
+# Mersenne Twister state words and position, the Random state version and how many rolls have been drawn
+TWISTER = struct.Struct('<625IiQ')
+# A range's bounds and how many of its rolls are left
+BLOCK = struct.Struct('<iiH')
+COUNT = struct.Struct('<H')
+# Waiting rolls follow as little-endian ints or doubles, so the state reads back the same on any machine
+ROLLS = '<{}i'
+FLOATS = '<{}d'
+
+
+def new_seed():
+    return int.from_bytes(os.urandom(8), 'little')
+
+
+class Dice():
+    def __init__(self, seed=None) -> None:
+        # One seed per session or simulation, the same seed replays the same fights
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.source = Random(seed)
+        self.blocks = {}
+        self.floats = []
+        # Counted a block at a time so rolling stays as cheap as it was
+        self.drawn = 0
+
+    def randint(self, low, high):
+        # Rolls are drawn a block at a time per range and handed out in order
+        block = self.blocks.get((low, high))
+        if not block:
+            block = self.fill(low, high)
+        return block.pop()
+
+    def randrange(self, start, stop):
+        return self.randint(start, stop - 1)
+
+    def random(self):
+        if not self.floats:
+            rand = self.source.random
+            self.floats = [rand() for _ in range(BLOCK_SIZE)]
+            self.drawn += BLOCK_SIZE
+        return self.floats.pop()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def fill(self, low, high):
+        # choices() draws in a single call, much cheaper than a randint() per roll
+        block = self.source.choices(range(low, high + 1), k=BLOCK_SIZE)
+        self.blocks[(low, high)] = block
+        self.drawn += BLOCK_SIZE
+        return block
+
+    def draws(self):
+        # Rolls handed out so far, anything still waiting in a block does not count
+        return self.drawn - sum(len(block) for block in self.blocks.values()) - len(self.floats)
+
+    def dumps(self):
+        version, words, _ = self.source.getstate()
+        parts = [TWISTER.pack(*words, version, self.drawn), COUNT.pack(len(self.blocks))]
+        for (low, high), block in self.blocks.items():
+            parts.append(BLOCK.pack(low, high, len(block)))
+            parts.append(struct.pack(ROLLS.format(len(block)), *block))
+        parts.append(COUNT.pack(len(self.floats)))
+        parts.append(struct.pack(FLOATS.format(len(self.floats)), *self.floats))
+        return b''.join(parts)
+
+    def loads(self, data):
+        # Everything is little-endian, so logs and snapshots replay on another host
+        state = TWISTER.unpack_from(data, 0)
+        offset = TWISTER.size
+        blocks = {}
+        count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            low, high, length = BLOCK.unpack_from(data, offset)
+            offset += BLOCK.size
+            rolls = struct.Struct(ROLLS.format(length))
+            blocks[(low, high)] = list(rolls.unpack_from(data, offset))
+            offset += rolls.size
+        length, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        floats = struct.unpack_from(FLOATS.format(length), data, offset)
+
+        self.source.setstate((state[625], state[:625], None))
+        self.drawn = state[626]
+        self.blocks = blocks
+        self.floats = list(floats)
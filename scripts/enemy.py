@@ -0,0 +1,87 @@
+from scripts.entity import Combatant, BASE_HEALTH
+from scripts.output import say
+
+
+class EnemyTemplate():
+    __slots__ = ('name', 'level', 'attack', 'defense', 'speed', 'max_health')
+
+    # Enemies carry no gear
+    damage = 0
+    mitigation = 0
+    finesse = 0
+
+    def __init__(self, name, level=1, attack=1, defense=1, speed=1) -> None:
+        object.__setattr__(self, 'name', name.removesuffix('.txt').capitalize())
+        object.__setattr__(self, 'level', level)
+        object.__setattr__(self, 'attack', attack)
+        object.__setattr__(self, 'defense', defense)
+        object.__setattr__(self, 'speed', speed)
+        # Enemy health has never scaled with level
+        object.__setattr__(self, 'max_health', BASE_HEALTH)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('{} is a shared enemy template and can not be changed'.format(self.name))
+
+    def __delattr__(self, key):
+        raise AttributeError('{} is a shared enemy template and can not be changed'.format(self.name))
+
+    def spawn(self):
+        return Enemy(self)
+
+
+class Enemy(Combatant):
+    __slots__ = ('template', 'current_health', 'attack_mod', 'defense_mod', 'speed_mod')
+
+    is_player = False
+
+    def __init__(self, template) -> None:
+        self.template = template
+        self.current_health = template.max_health
+
+        self.attack_mod = 0
+        self.defense_mod = 0
+        self.speed_mod = 0
+
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def level(self):
+        return self.template.level
+
+    @property
+    def attack(self):
+        return self.template.attack
+
+    @property
+    def defense(self):
+        return self.template.defense
+
+    @property
+    def speed(self):
+        return self.template.speed
+
+    @property
+    def max_health(self):
+        return self.template.max_health
+
+    @property
+    def damage(self):
+        return self.template.damage
+
+    @property
+    def mitigation(self):
+        return self.template.mitigation
+
+    @property
+    def finesse(self):
+        return self.template.finesse
+
+    def print_entity(self):
+        attack = self.attack + self.attack_mod
+        defense = self.defense + self.defense_mod
+        speed = self.speed + self.speed_mod
+
+        say('{} level {}: Health {}, Attack {}, Defense {}, Speed {}', self.name, self.level, self.current_health, attack, defense, speed)
+        say()
@@ -1,14 +1,109 @@
 from scripts.inventory import Inventory
-from random import Random
 from abc import ABC, abstractmethod
 import math
+from scripts.output import say
 
 
-class Entity():
+CRIT_CHANCE = 10
+BASE_HEALTH = 5
+
+# Bits of Entity._dirty, set when the cached health or combat numbers need working out again
+HEALTH_DIRTY = 1
+COMBAT_DIRTY = 2
+
+
+class Combatant():
+    # Shared combat math, subclasses provide the stats, modifiers and health
+    __slots__ = ()
+
+    def reset_health(self):
+        self.current_health = self.max_health
+
+    def roll_attack(self, rng):
+        attack_modifier_low, attack_modifier_high = self.attack_range()
+        # print('Range that can be rolled is from {} - {}'.format(attack_modifier_low, attack_modifier_high))
+
+        damage = rng.randint(attack_modifier_low, attack_modifier_high)
+
+        say('{} rolled {} for damage...', self.name, damage)
+        
+        total_damage = self.roll_crit(damage, rng)
+        return total_damage
+    
+    def roll_crit(self, damage, rng):
+        crit_modifier = self.crit_modifier()
+        crit_chance = CRIT_CHANCE
+
+        roll = rng.randrange(1, 101) - crit_modifier
+
+        say('{} needs a {} or less to crit...', self.name, crit_chance)
+        say('{} rolled a {} to crit with a modifier of {}...', self.name, roll, crit_modifier)
+        
+        if roll <= crit_chance:
+            total_damage = (damage * 2) + self.crit_bonus()
+
+            say('{} lands a crit for {} damage...', self.name, total_damage)
+            
+            return total_damage
+        else:
+            return damage
+        
+    def take_damage(self, damage, combat=True):
+        if combat:
+            total_damage = damage - self.damage_reduction()
+            
+            if total_damage < 0:
+                total_damage = 0
+            
+            say('{} took {} damage after {} defense...', self.name, total_damage, (damage - total_damage))
+            
+            self.current_health -= total_damage
+
+    def attack_range(self):
+        attack = self.attack + self.attack_mod
+        low = self.round_up(attack / 2) + self.damage
+        high = self.round_up(attack * 2) + self.damage
+        return low, high
+
+    def crit_modifier(self):
+        speed = self.speed + self.speed_mod
+        return self.round_up((speed / 2) + self.finesse)
+
+    def crit_bonus(self):
+        return self.round_up(self.speed + self.speed_mod)
+
+    def damage_reduction(self):
+        defense = self.defense + self.defense_mod
+        return self.round_up((defense / 2) + self.mitigation)
+
+    def round_up(self, num):
+        rouned = math.ceil(num)
+        return rouned
+    
+    def round_down(self, num):
+        rounded = math.floor(num)
+        return rounded
+    
+    def is_dead(self):
+        if self.current_health <= 0:
+            return True
+        else:
+            return False
+
+
+class Entity(Combatant):
+    __slots__ = ('is_player', '_name', '_level', 'target',
+                 '_attack', '_defense', '_speed',
+                 'max_health', 'current_health',
+                 '_attack_mod', '_defense_mod', '_speed_mod',
+                 '_damage', '_mitigation', '_finesse',
+                 '_inventory', '_gear_version', '_dirty',
+                 '_attack_range', '_crit_modifier', '_crit_bonus', '_damage_reduction')
+
     def __init__(self):
         self.is_player = False
         self._name = 'Joe'
-        self.level = 1
+        self._level = 1
 
         self.target = 20
 
@@ -16,19 +111,50 @@ class Entity():
         self._defense = 1
         self._speed = 1
 
-        self.health_base = 5 * self.level
         self.max_health = self.health_base
         self.current_health = self.max_health
         
-        self.attack_mod = 0
-        self.defense_mod = 0
-        self.speed_mod = 0
+        self._attack_mod = 0
+        self._defense_mod = 0
+        self._speed_mod = 0
 
         self._damage = 0
         self._mitigation = 0
         self._finesse = 0
 
-        self.inventory = Inventory()
+        self._inventory = None
+
+        # Derived stats are cached and only worked out again after something they depend on changes
+        self._gear_version = -1
+        self._dirty = HEALTH_DIRTY | COMBAT_DIRTY
+
+    @property
+    def inventory(self):
+        # Built on first use so entities that never carry anything stay small
+        if self._inventory is None:
+            self._inventory = Inventory()
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, value):
+        self._inventory = value
+        self._gear_version = -1
+
+    def mark_dirty(self):
+        self._dirty = HEALTH_DIRTY | COMBAT_DIRTY
+
+    @property
+    def health_base(self):
+        return BASE_HEALTH * self.level
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, value):
+        self._level = value
+        self.mark_dirty()
     
     @property
     def name(self):
@@ -46,6 +172,7 @@ class Entity():
     @damage.setter
     def damage(self, value):
         self._damage = self.round_down(value / 2)
+        self._dirty |= COMBAT_DIRTY
 
     @property
     def mitigation(self):
@@ -54,6 +181,7 @@ class Entity():
     @mitigation.setter
     def mitigation(self, value):
         self._mitigation = self.round_down(value / 2)
+        self._dirty |= COMBAT_DIRTY
 
     @property
     def finesse(self):
@@ -62,6 +190,7 @@ class Entity():
     @finesse.setter
     def finesse(self, value):
         self._finesse = self.round_down(value / 2)
+        self._dirty |= COMBAT_DIRTY
 
     @property
     def attack(self):
@@ -70,6 +199,16 @@ class Entity():
     @attack.setter
     def attack(self, value):
         self._attack = self.round_up(value)
+        self._dirty |= COMBAT_DIRTY
+
+    @property
+    def attack_mod(self):
+        return self._attack_mod
+
+    @attack_mod.setter
+    def attack_mod(self, value):
+        self._attack_mod = value
+        self._dirty |= COMBAT_DIRTY
 
     @property
     def defense(self):
@@ -78,6 +217,16 @@ class Entity():
     @defense.setter
     def defense(self, value):
         self._defense = self.round_up(value)
+        self.mark_dirty()
+
+    @property
+    def defense_mod(self):
+        return self._defense_mod
+
+    @defense_mod.setter
+    def defense_mod(self, value):
+        self._defense_mod = value
+        self._dirty |= COMBAT_DIRTY
 
     @property
     def speed(self):
@@ -86,72 +235,57 @@ class Entity():
     @speed.setter
     def speed(self, value):
         self._speed = self.round_up(value)
+        self._dirty |= COMBAT_DIRTY
 
-    def reset_health(self):
-        self.current_health = self.max_health
+    @property
+    def speed_mod(self):
+        return self._speed_mod
 
-    def set_health(self, value):
-        self.current_health += value
-    
-    def roll_attack(self):
-        r = Random()
-        attack = self.attack + self.attack_mod
-        
-        attack_modifier_high = self.round_up(attack * 2) + self.damage
-        attack_modifier_low = self.round_up(attack / 2) + self.damage
-        # print('Range that can be rolled is from {} - {}'.format(attack_modifier_low, attack_modifier_high))
+    @speed_mod.setter
+    def speed_mod(self, value):
+        self._speed_mod = value
+        self._dirty |= COMBAT_DIRTY
 
-        damage = r.randint(attack_modifier_low, attack_modifier_high)
+    def refresh_combat(self):
+        self._attack_range = Combatant.attack_range(self)
+        self._crit_modifier = Combatant.crit_modifier(self)
+        self._crit_bonus = Combatant.crit_bonus(self)
+        self._damage_reduction = Combatant.damage_reduction(self)
+        self._dirty &= ~COMBAT_DIRTY
 
-        print('{} rolled {} for damage...'.format(self.name, damage))
-        
-        total_damage = self.roll_crit(damage)
-        return total_damage
-    
-    def roll_crit(self, damage):
-        r = Random()
-        speed = self.speed + self.speed_mod
+    def attack_range(self):
+        if self._dirty & COMBAT_DIRTY:
+            self.refresh_combat()
+        return self._attack_range
 
-        crit_modifier = self.round_up((speed / 2) + self.finesse)
-        crit_chance = 10
-        crit_damage_bonus = speed
+    def crit_modifier(self):
+        if self._dirty & COMBAT_DIRTY:
+            self.refresh_combat()
+        return self._crit_modifier
 
-        roll = r.randrange(1, 101, 1) - crit_modifier
+    def crit_bonus(self):
+        if self._dirty & COMBAT_DIRTY:
+            self.refresh_combat()
+        return self._crit_bonus
 
-        print('{} needs a {} or less to crit...'.format(self.name, crit_chance))
-        print('{} rolled a {} to crit with a modifier of {}...'.format(self.name, roll, crit_modifier))
-        
-        if roll <= crit_chance:
-            total_damage = (damage * 2) + self.round_up(crit_damage_bonus)
-
-            print('{} lands a crit for {} damage...'.format(self.name, total_damage))
-            
-            return total_damage
-        else:
-            return damage
-        
-    def take_damage(self, damage, combat=True):
-        defense = self.defense + self.defense_mod
-        if combat:
-            total_damage = damage - self.round_up((defense / 2) + self.mitigation)
-            
-            if total_damage < 0:
-                total_damage = 0
-            
-            print('{} took {} damage after {} defense...'.format(self.name, total_damage, (damage - total_damage)))
-            
-            self.current_health -= total_damage
+    def damage_reduction(self):
+        if self._dirty & COMBAT_DIRTY:
+            self.refresh_combat()
+        return self._damage_reduction
 
+    def set_health(self, value):
+        self.current_health += value
+    
     def print_entity(self):
         attack = self.attack + self.attack_mod
         defense = self.defense + self.defense_mod
         speed = self.speed + self.speed_mod
 
-        print('{} level {}: Health {}, Attack {}, Defense {}, Speed {}'.format(self.name, self.level, self.current_health, attack, defense, speed))
+        say('{} level {}: Health {}, Attack {}, Defense {}, Speed {}', self.name, self.level, self.current_health, attack, defense, speed)
         if self.inventory.equipped_items['Held'] is not None:
-            print('You are currently weilding a {} as your weapon.'.format(self.inventory.equipped_items['Held'].name))
+            say('You are currently weilding a {} as your weapon.', self.inventory.equipped_items['Held'].name)
         if self.inventory.equipped_items['Body'] is not None:
-            print('You are currently wearing {} for armor.'.format(self.inventory.equipped_items['Body'].name))
+            say('You are currently wearing {} for armor.', self.inventory.equipped_items['Body'].name)
         
         if self.inventory.equipped_items['Trinkets']:
             formated_trinkets = ''
@@ -162,44 +296,24 @@ class Entity():
                     trinket = '{}, '.format(v.name)
                 formated_trinkets += trinket
                 
-            print('You are currently wearing {} as your trinkets.'.format(formated_trinkets))
-        print()
+            say('You are currently wearing {} as your trinkets.', formated_trinkets)
+        say()
 
-    def round_up(self, num):
-        rouned = math.ceil(num)
-        return rouned
-    
-    def round_down(self, num):
-        rounded = math.floor(num)
-        return rounded
-    
     def update_stats(self):
-        self.health_base = 5 * self.level
-        self.max_health = self.health_base + self.round_up(self.defense / 2)
-
-        total_stats = self.inventory.get_stat_modifiers()
-        for key, value in total_stats.items():
-            if key == 'damage':
-                self.damage = value
-            elif key == 'mitigation':
-                self.mitigation = value
-            elif key == 'finesse':
-                self.finesse = value
-            elif key == 'attack':
-                self.attack_mod = value
-            elif key == 'defense':
-                self.defense_mod = value
-            elif key == 'speed':
-                self.speed_mod = value
+        if self._dirty & HEALTH_DIRTY:
+            self.max_health = self.health_base + self.round_up(self.defense / 2)
+            self._dirty &= ~HEALTH_DIRTY
+
+        # The inventory keeps running totals, so they only need copying over when gear has changed
+        inventory = self.inventory
+        inventory.refresh()
+        if self._gear_version != inventory.version:
+            (self.damage, self.mitigation, self.finesse,
+             self.attack_mod, self.defense_mod, self.speed_mod) = inventory.modifiers
+            self._gear_version = inventory.version
 
         self.accounting()
 
-    def is_dead(self):
-        if self.current_health <= 0:
-            return True
-        else:
-            return False
-        
     def equip_item(self, value):
         self.inventory.equip_item(value)
         self.update_stats()
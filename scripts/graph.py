@@ -0,0 +1,141 @@
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from scripts.registry import normalize, UnknownNameError
+
+
+UNREACHABLE = -1
+
+
+class WorldGraph():
+    def __init__(self, area_list) -> None:
+        self.build(area_list)
+
+    def build(self, area_list):
+        self.locations = list(area_list)
+        self.names = [location.name for location in self.locations]
+        self.ids = {normalize(name): i for i, name in enumerate(self.names)}
+
+        # Connections as CSR arrays, the edges of location i are targets[offsets[i]:offsets[i + 1]]
+        # Moving costs the travel time of the location being moved into, as in World.move_area
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.weights = array('i')
+        self.missing = []
+        for location in self.locations:
+            for name in location.connections:
+                target = self.ids.get(normalize(name))
+                if target is None:
+                    self.missing.append((location.name, name))
+                    continue
+                self.targets.append(target)
+                self.weights.append(self.locations[target].travel_time)
+            self.offsets.append(len(self.targets))
+
+        self.table = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, name):
+        try:
+            return self.ids[normalize(name)]
+        except KeyError:
+            raise UnknownNameError('location', name) from None
+
+    def neighbours(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def connections(self, name):
+        return [self.locations[j] for j in self.neighbours(self.id(name))]
+
+    def hops(self, *starts):
+        # Fewest moves to every location from the nearest of the starts
+        hops = array('i', [UNREACHABLE]) * len(self)
+        queue = deque()
+        for start in starts:
+            source = self.id(start)
+            hops[source] = 0
+            queue.append(source)
+        offsets, targets = self.offsets, self.targets
+        while queue:
+            i = queue.popleft()
+            for edge in range(offsets[i], offsets[i + 1]):
+                j = targets[edge]
+                if hops[j] == UNREACHABLE:
+                    hops[j] = hops[i] + 1
+                    queue.append(j)
+        return hops
+
+    def search(self, source):
+        # Dijkstra on travel time, returns the distances and the previous step of each best route
+        distances = array('i', [UNREACHABLE]) * len(self)
+        previous = array('i', [UNREACHABLE]) * len(self)
+        distances[source] = 0
+        heap = [(0, source)]
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        while heap:
+            distance, i = heappop(heap)
+            if distance > distances[i]:
+                continue
+            for edge in range(offsets[i], offsets[i + 1]):
+                j = targets[edge]
+                total = distance + weights[edge]
+                if distances[j] == UNREACHABLE or total < distances[j]:
+                    distances[j] = total
+                    previous[j] = i
+                    heappush(heap, (total, j))
+        return distances, previous
+
+    def distances(self, start):
+        distances, _ = self.search(self.id(start))
+        return distances
+
+    def route(self, start, goal):
+        # Names of the locations to move through, goal included; None when there is no way there
+        source = self.id(start)
+        target = self.id(goal)
+        distances, previous = self.search(source)
+        if distances[target] == UNREACHABLE:
+            return None
+
+        steps = []
+        i = target
+        while i != source:
+            steps.append(self.names[i])
+            i = previous[i]
+        steps.reverse()
+        return steps
+
+    def route_to_camp(self, start, camp):
+        return self.route(start, camp)
+
+    def travel_time(self, start, goal):
+        return self.all_pairs()[self.id(start) * len(self) + self.id(goal)]
+
+    def reachable(self, *starts):
+        hops = self.hops(*starts)
+        return [self.names[i] for i in range(len(self)) if hops[i] != UNREACHABLE]
+
+    def unreachable(self, *starts):
+        hops = self.hops(*starts)
+        return [self.names[i] for i in range(len(self)) if hops[i] == UNREACHABLE]
+
+    def all_pairs(self):
+        # Row i holds the travel time from location i to every other, built on first use
+        if self.table is None:
+            table = array('i')
+            for i in range(len(self)):
+                distances, _ = self.search(i)
+                table.extend(distances)
+            self.table = table
+        return self.table
+
+    def validate(self, *starts):
+        # Starts are every place the player can appear without walking, such as camps
+        problems = []
+        for name, target in self.missing:
+            problems.append('{} connects to {}, which does not exist'.format(name, target))
+        for name in self.unreachable(*starts):
+            problems.append('{} can not be reached'.format(name))
+        return problems
@@ -1,18 +1,79 @@
 from abc import ABC, abstractmethod
-from collections import Counter
+from types import MappingProxyType
+from scripts.output import say
+from scripts.item import GEAR_STATS, TRINKET_STATS, stat_generation
 
 
 TYPE_LIST = ['weapon', 'armor', 'crafting', 'wealth', 'trinket']
 EQUIPABLE_TYPES = ['weapon', 'armor', 'trinket']
+# Position of each stat in the running totals
+STAT_INDEXES = {key: i for i, key in enumerate(GEAR_STATS + TRINKET_STATS)}
+
+# Shared by every inventory until it first stores, equips or totals something, read-only so a missed
+# swap for the inventory's own container fails loudly instead of changing every inventory at once
+EMPTY = MappingProxyType({})
+NO_GEAR = MappingProxyType({'Held': None, 'Body': None, 'Trinkets': ()})
+NO_MODIFIERS = (0,) * len(STAT_INDEXES)
 
 
 class Inventory():
+    __slots__ = ('stored_items', 'equipped_items', 'owned_items', 'listing', 'all_items', '_income',
+                 'modifiers', 'version', 'generation')
+
     def __init__(self) -> None:
-        self.stored_items = []
-        self.equipped_items = {'Held': None, 'Body': None, 'Trinkets': []}
-        self.owned_items = []
-        self.all_items = []
-        self.income = 0
+        # Item to count, in the order each item was first picked up
+        self.stored_items = EMPTY
+        self.equipped_items = NO_GEAR
+        # Every item ever picked up, the values are unused so it works as a set that keeps its order
+        self.owned_items = EMPTY
+        # The bag as a numbered list, only built again after an item appears or runs out
+        self.listing = None
+        # Replaced by the world's item list, shared by every inventory until then
+        self.all_items = ()
+        self._income = 0
+
+        # Running totals of equipped gear in GEAR_STATS then TRINKET_STATS order,
+        # version goes up whenever gear or income changes
+        self.modifiers = NO_MODIFIERS
+        self.version = 0
+        self.generation = stat_generation()
+
+    @property
+    def income(self):
+        return self._income
+
+    @income.setter
+    def income(self, value):
+        self._income = value
+        self.version += 1
+
+    def add_modifiers(self, item, keys, sign):
+        if self.modifiers is NO_MODIFIERS:
+            self.modifiers = list(NO_MODIFIERS)
+        for key in keys:
+            self.modifiers[STAT_INDEXES[key]] += sign * getattr(item, key)
+        self.version += 1
+
+    def refresh(self):
+        # Equipped items can have their stats changed by an asset reload, totals are then counted again
+        if self.generation != stat_generation():
+            self.recount()
+
+    def recount(self):
+        self.generation = stat_generation()
+        self.modifiers = NO_MODIFIERS
+        for slot in ['Held', 'Body']:
+            if self.equipped_items[slot] is not None:
+                self.add_modifiers(self.equipped_items[slot], GEAR_STATS, 1)
+        for trinket in self.equipped_items['Trinkets']:
+            self.add_modifiers(trinket, TRINKET_STATS, 1)
+        self.version += 1
+
+    def gear(self):
+        # Swapped for this inventory's own slots before anything is equipped or stowed
+        if self.equipped_items is NO_GEAR:
+            self.equipped_items = {'Held': None, 'Body': None, 'Trinkets': []}
+        return self.equipped_items
 
     def set_items(self, value):
         self.all_items = value
@@ -20,53 +81,92 @@ class Inventory():
     def get_items(self):
         return self.all_items
 
-    def add_to_stored_items(self, value):
+    def add_to_stored_items(self, value, count=1):
         # print('Attempting to add {}'.format(value.name))
-        self.stored_items.append(value)
-        self.owned_items.append(value)
+        stored = self.stored_items.get(value)
+        if stored is None:
+            if self.stored_items is EMPTY:
+                self.stored_items = {}
+            if self.owned_items is EMPTY:
+                self.owned_items = {}
+            self.stored_items[value] = count
+            self.listing = None
+        else:
+            self.stored_items[value] = stored + count
+        self.owned_items[value] = None
+
+    def take_from_stored_items(self, value):
+        count = self.stored_items[value]
+        if count > 1:
+            self.stored_items[value] = count - 1
+        else:
+            del self.stored_items[value]
+            self.listing = None
+        return value
+
+    def count(self, value):
+        return self.stored_items.get(value, 0)
+
+    def item_at(self, index):
+        if self.listing is None:
+            self.listing = list(self.stored_items)
+        return self.listing[index]
+
+    def owns(self, value):
+        return value in self.owned_items
 
     def equip_item(self, value):
         # print('Attempting to equip {} type {}'.format(value.name, value.type))
         if value.type in EQUIPABLE_TYPES:
+            self.gear()
             if value.type == 'weapon':
                 # self.stow_item(self.equipped_items['Held'])
-                self.equipped_items['Held'] = self.stored_items.pop(self.stored_items.index(value))
-                print('Equipped {} in hands.\n'.format(self.equipped_items['Held'].name))
+                if self.equipped_items['Held'] is not None:
+                    self.add_modifiers(self.equipped_items['Held'], GEAR_STATS, -1)
+                self.equipped_items['Held'] = self.take_from_stored_items(value)
+                self.add_modifiers(value, GEAR_STATS, 1)
+                say('Equipped {} in hands.\n', self.equipped_items['Held'].name)
 
             elif value.type == 'armor':
                 # self.stow_item(self.equipped_items['Body'])
-                self.equipped_items['Body'] = self.stored_items.pop(self.stored_items.index(value))
-                print('Equipped {} on body.\n'.format(self.equipped_items['Body'].name))
+                if self.equipped_items['Body'] is not None:
+                    self.add_modifiers(self.equipped_items['Body'], GEAR_STATS, -1)
+                self.equipped_items['Body'] = self.take_from_stored_items(value)
+                self.add_modifiers(value, GEAR_STATS, 1)
+                say('Equipped {} on body.\n', self.equipped_items['Body'].name)
             
             elif value.type == 'trinket':
                 if value not in self.equipped_items['Trinkets']:
-                    self.equipped_items['Trinkets'].append(value)
-                    self.stored_items.remove(value)
-                    print('Equipped {} as a trinket.\n'.format(self.equipped_items['Trinkets'][-1].name))
+                    self.equipped_items['Trinkets'].append(self.take_from_stored_items(value))
+                    self.add_modifiers(value, TRINKET_STATS, 1)
+                    say('Equipped {} as a trinket.\n', self.equipped_items['Trinkets'][-1].name)
 
         else:
-            print('You can not equip {}.'.format(value))
+            say('You can not equip {}.', value)
 
     def stow_item(self, value):
+        self.gear()
         if value.type == 'weapon':
+            self.add_to_stored_items(self.equipped_items['Held'])
             self.equipped_items['Held'] = None
-            self.stored_items.append(self.equipped_items['Held'])
-            print('Stowed {} in bag'.format(value.name))
+            self.add_modifiers(value, GEAR_STATS, -1)
+            say('Stowed {} in bag', value.name)
         elif value.type == 'armor':
+            self.add_to_stored_items(self.equipped_items['Body'])
             self.equipped_items['Body'] = None
-            self.stored_items.append(self.equipped_items['Body'])
-            print('Stowed {} in bag'.format(value.name))
+            self.add_modifiers(value, GEAR_STATS, -1)
+            say('Stowed {} in bag', value.name)
 
     def open_bag(self):
         # for i in self.stored_items:
             # print('stored item {}'.format(i))
-        print('You open your worn rucksack and carefully arrange the conetnts around you.')
-        print()
+        say('You open your worn rucksack and carefully arrange the conetnts around you.')
+        say()
         """
         if self.equipped_items['Held'] is not None:
-            print('You are currently weilding a {} as your weapon.'.format(self.equipped_items['Held'].name))
+            say('You are currently weilding a {} as your weapon.', self.equipped_items['Held'].name)
         if self.equipped_items['Body'] is not None:
-            print('You are currently wearing {} for armor.'.format(self.equipped_items['Body'].name))
+            say('You are currently wearing {} for armor.', self.equipped_items['Body'].name)
         
         if self.equipped_items['Trinkets']:
             formated_trinkets = ''
@@ -77,77 +177,28 @@ class Inventory():
                     trinket = '{}, '.format(v.name)
                 formated_trinkets += trinket
                 
-            print('You are currently wearing {} as your trinkets.'.format(formated_trinkets))
-        print()
+            say('You are currently wearing {} as your trinkets.', formated_trinkets)
+        say()
         """
-        consolidated_items = Counter(self.stored_items)
-        for item, count in consolidated_items.items():
-            if count > 1:
-                item.ammount = count
-            else:
-                item.ammount = 1
+        # Items already stack as they are picked up, so there is nothing to sort out here
 
-        stored_item_set = set(self.stored_items)
-        self.stored_items = list(stored_item_set)
-
-        while True:
-            for i, v in enumerate(self.stored_items):
-                if v.ammount != 1:
-                    print('{}. {} ({}) x{}'.format(i + 1, v.name, v.type, v.ammount))
-                else:
-                    print('{}. {} ({})'.format(i + 1, v.name, v.type))
-            
-            print()
-            print('1. Inspect')
-            print('2. Equip')
-            print('3. Sell')
-            print('4. Close bag')
-            print()
-            action = int(input('What would you like to do? '))
-
-            if action == 1:
-                choice = int(input('Which item would you like to inspect? '))
-                print()
-                self.stored_items[choice - 1].display()
-
-            elif action == 2:
-                choice = int(input('What would you like to equip? '))
-                print()
-                self.equip_item(self.stored_items[choice - 1])
-
-            elif action == 3:
-                choice = int(input("What would you like to sell? "))
-                print()
-                self.sell_wealth(self.stored_items[choice - 1])
-
-            elif action == 4:
-                break
+    def display_bag(self):
+        for i, (v, count) in enumerate(self.stored_items.items()):
+            if count != 1:
+                say('{}. {} ({}) x{}', i + 1, v.name, v.type, count)
+            else:
+                say('{}. {} ({})', i + 1, v.name, v.type)
+        
+        say()
+        say('1. Inspect')
+        say('2. Equip')
+        say('3. Sell')
+        say('4. Close bag')
+        say()
         
     def get_stat_modifiers(self):
-        total_stats = {'damage': 0, 'mitigation': 0, 'finesse': 0, 'attack': 0, 'defense': 0, 'speed': 0}
-
-        if self.equipped_items['Held'] is not None: 
-            total_stats['damage'] += self.equipped_items['Held'].damage
-            total_stats['mitigation'] += self.equipped_items['Held'].mitigation
-            total_stats['finesse'] += self.equipped_items['Held'].finesse
-
-        if self.equipped_items['Body'] is not None:
-            total_stats['damage'] += self.equipped_items['Body'].damage
-            total_stats['mitigation'] += self.equipped_items['Body'].mitigation
-            total_stats['finesse'] += self.equipped_items['Body'].finesse
-
-        if self.equipped_items['Trinkets']:
-            for i, v in enumerate(self.equipped_items['Trinkets']):
-                total_stats['attack'] += v.attack
-                total_stats['defense'] += v.defense
-                total_stats['speed'] += v.speed
-    
-        return total_stats
+        return dict(zip(STAT_INDEXES, self.modifiers))
     
     def sell_wealth(self, item):
-        if item.ammount > 1:
-            item.ammount -= 1
-            self.income += item.worth
-        else:
-            self.stored_items.remove(item)
-            self.income += item.worth
\ No newline at end of file
+        self.take_from_stored_items(item)
+        self.income += item.worth
\ No newline at end of file
@@ -1,28 +1,77 @@
 from abc import ABC, abstractmethod
+from scripts.description import DESCRIPTIONS
+from scripts.output import say
 
 
 TYPE_LIST = ['weapon', 'armor', 'crafting', 'wealth', 'trinket']
+GEAR_STATS = ('damage', 'mitigation', 'finesse')
+TRINKET_STATS = ('attack', 'defense', 'speed')
+
+# All six stats share one int, each in its own biased 16 bit field, so every item stat must be within
+# -32768 to 32767. The builder reports an item outside that as a load error, which the validator lists
+STAT_BITS = 16
+STAT_BIAS = 1 << (STAT_BITS - 1)
+STAT_MASK = (1 << STAT_BITS) - 1
+NO_STATS = sum(STAT_BIAS << (i * STAT_BITS) for i in range(len(GEAR_STATS + TRINKET_STATS)))
+
+# Most items share a handful of stat lines and spawn lists, so identical ones are stored once
+STAT_VALUES = {}
+SPAWN_LOCATIONS = {}
+
+# Goes up whenever an existing item's stats are changed by a reload
+_stat_generation = 0
+
+
+def stat_generation():
+    return _stat_generation
+
+
+def bump_stat_generation():
+    global _stat_generation
+    _stat_generation += 1
+
+
+def packed_stat(index):
+    shift = index * STAT_BITS
+    name = (GEAR_STATS + TRINKET_STATS)[index]
+
+    def get(self):
+        return ((self._stats >> shift) & STAT_MASK) - STAT_BIAS
+
+    def set(self, value):
+        if not -STAT_BIAS <= value < STAT_BIAS:
+            raise ValueError('Item {} must be between {} and {}, got {}'.format(name, -STAT_BIAS, STAT_BIAS - 1, value))
+        stats = (self._stats & ~(STAT_MASK << shift)) | ((value + STAT_BIAS) << shift)
+        self._stats = STAT_VALUES.setdefault(stats, stats)
+
+    return property(get, set)
 
 
 class Item(ABC):
+    __slots__ = ('_name', '_description', '_type',
+                 '_stat_keys', '_stats', 'worth', '_spawn_location', 'drop_weight')
+
+    damage = packed_stat(0)
+    mitigation = packed_stat(1)
+    finesse = packed_stat(2)
+    attack = packed_stat(3)
+    defense = packed_stat(4)
+    speed = packed_stat(5)
+
     def __init__(self) -> None:
         self._name = ''
+        # Either the text itself or a source to read it from on demand
         self._description = ''
         self._type = ''
-        self.ammount = 1
         
-        self._stat_modifiers = {}
-        self.damage = 0
-        self.mitigation = 0
-        self.finesse = 0
-
-        self.attack = 0
-        self.defense = 0
-        self.speed = 0
+        # Which stats came from the asset file, the values live in the packed field
+        self._stat_keys = ()
+        self._stats = NO_STATS
 
         self.worth = 0
 
-        self.spawn_location = []
+        self.spawn_location = ()
+        self.drop_weight = 1
 
     @property
     def name(self):
@@ -35,15 +84,35 @@ class Item(ABC):
 
     @property
     def description(self):
-        return self._description
+        if isinstance(self._description, str):
+            return self._description
+        return DESCRIPTIONS.get(self._description)
 
     @description.setter
     def description(self, value):
+        self._description = self.description
         for i in value:
             if i != '':
                 self._description += i + '\n'
-            else:
-                value.remove(i)
+
+    @property
+    def description_source(self):
+        if isinstance(self._description, str):
+            return None
+        return self._description
+
+    @description_source.setter
+    def description_source(self, value):
+        self._description = '' if value is None else value
+
+    @property
+    def spawn_location(self):
+        return self._spawn_location
+
+    @spawn_location.setter
+    def spawn_location(self, value):
+        value = tuple(value)
+        self._spawn_location = SPAWN_LOCATIONS.setdefault(value, value)
 
     @property
     def type(self):
@@ -58,36 +127,36 @@ class Item(ABC):
 
     @property
     def stat_modifiers(self):
-        return self._stat_modifiers
+        return {key: getattr(self, key) for key in self._stat_keys}
     
     @stat_modifiers.setter
     def stat_modifiers(self, value):
-        self._stat_modifiers = value
         if 'attack' in value:
             # print('Setting stats for trinket')
             self.attack = value['attack']
             self.defense = value['defense']
             self.speed = value['speed']
+            self._stat_keys = TRINKET_STATS
         else:
             # print('Setting stats for non-trinket')
             self.damage = value['damage']
             self.mitigation = value['mitigation']
             self.finesse = value['finesse']
+            self._stat_keys = GEAR_STATS
 
     def display(self):
-        print('{} ({})'.format(self.name, self.type))
+        say('{} ({})', self.name, self.type)
         if self.type in ['weapon', 'armor']:
-            print('Damage +{}, Mitigation +{}, Finesse +{}'.format(self.damage, self.mitigation, self.finesse))
+            say('Damage +{}, Mitigation +{}, Finesse +{}', self.damage, self.mitigation, self.finesse)
         elif self.type == 'trinket':
-            print('Attack +{}, Defense +{}, Speed +{}'.format(self.attack, self.damage, self.speed))
+            say('Attack +{}, Defense +{}, Speed +{}', self.attack, self.damage, self.speed)
         elif self.type == 'wealth':
-            print('Appraised as having {} value.'.format(self.appraise_worth()))
+            say('Appraised as having {} value.', self.appraise_worth())
         elif self.type == 'crafting':
-            print('This can be used to improve weapons or armor.')
+            say('This can be used to improve weapons or armor.')
         
-        print('Description:\n- {}'.format(self.description))
-        print()
-        input('Press enter to return')
+        say('Description:\n- {}', self.description)
+        say()
 
     def appraise_worth(self):
         appraisal = 'worthless'
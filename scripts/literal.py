@@ -0,0 +1,132 @@
+import re
+
+
+# Strings, whole numbers and the punctuation of list and dict literals, with leading spaces skipped
+TOKEN = re.compile(r"""\s*(?:'([^'\\\n]*(?:\\.[^'\\\n]*)*)'|"([^"\\\n]*(?:\\.[^"\\\n]*)*)"|(-?\d+)(?![\w.])|([\[\]{}:,]))""")
+SPACE = re.compile(r'\s*')
+
+# Asset lines are nearly always a flat list of strings or a dict of whole numbers,
+# those are checked and read by a couple of regexes before falling back to the full parser
+STRING = r"'([^'\\\n]*(?:\\.[^'\\\n]*)*)'" + r'|"([^"\\\n]*(?:\\.[^"\\\n]*)*)"'
+BARE_STRING = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'" + r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+NUMBER = r'-?\d+(?![\w.])'
+PAIR = r'(?:{})\s*:\s*{}'.format(BARE_STRING, NUMBER)
+STRING_LIST = re.compile(r'\s*\[\s*(?:(?:{0})\s*(?:,\s*(?:{0})\s*)*,?\s*)?\]\s*'.format(BARE_STRING))
+NUMBER_DICT = re.compile(r'\s*\{{\s*(?:{0}\s*(?:,\s*{0}\s*)*,?\s*)?\}}\s*'.format(PAIR))
+STRINGS = re.compile(STRING)
+PAIRS = re.compile(r'(?:{})\s*:\s*({})'.format(STRING, NUMBER))
+ESCAPE = re.compile(r'\\(.)')
+ESCAPES = {'\\': '\\', "'": "'", '"': '"', 'n': '\n', 't': '\t'}
+
+
+class ParseError(ValueError):
+    def __init__(self, message, path=None, line=None, column=None) -> None:
+        if path is not None:
+            location = ':'.join(str(part) for part in [path, line, column] if part is not None)
+        elif line is not None:
+            location = 'line {}, column {}'.format(line, column)
+        else:
+            location = 'column {}'.format(column)
+        super().__init__('{}: {}'.format(location, message))
+        self.reason = message
+        self.path = path
+        self.line = line
+        self.column = column
+
+
+def unescape(text):
+    # Same as Python for the escapes asset files use, anything else keeps its backslash
+    if '\\' not in text:
+        return text
+    return ESCAPE.sub(lambda m: ESCAPES.get(m.group(1), m.group(0)), text)
+
+
+class Parser():
+    __slots__ = ('text', 'position', 'path', 'line')
+
+    def __init__(self, text, path=None, line=None) -> None:
+        self.text = text
+        self.position = 0
+        self.path = path
+        self.line = line
+
+    def error(self, message, position=None):
+        column = (self.position if position is None else position) + 1
+        return ParseError(message, self.path, self.line, column)
+
+    def start(self, match):
+        return SPACE.match(self.text, match.start()).end()
+
+    def next(self):
+        match = TOKEN.match(self.text, self.position)
+        if match is None:
+            start = SPACE.match(self.text, self.position).end()
+            if start == len(self.text):
+                raise self.error('unexpected end of line', start)
+            raise self.error('unexpected {!r}'.format(self.text[start]), start)
+        self.position = match.end()
+        return match
+
+    def value(self, match=None):
+        if match is None:
+            match = self.next()
+        single, double, number, mark = match.groups()
+        if single is not None:
+            return unescape(single)
+        if double is not None:
+            return unescape(double)
+        if number is not None:
+            return int(number)
+        if mark == '[':
+            return self.list()
+        if mark == '{':
+            return self.dict()
+        raise self.error('unexpected {!r}'.format(mark), match.start(4))
+
+    def list(self):
+        items = []
+        while True:
+            match = self.next()
+            if match.group(4) == ']':
+                return items
+            items.append(self.value(match))
+            match = self.next()
+            if match.group(4) == ']':
+                return items
+            if match.group(4) != ',':
+                raise self.error('expected , or ] in list', self.start(match))
+
+    def dict(self):
+        items = {}
+        while True:
+            match = self.next()
+            if match.group(4) == '}':
+                return items
+            key = self.value(match)
+            if not isinstance(key, str):
+                raise self.error('dict keys must be strings', self.start(match))
+            match = self.next()
+            if match.group(4) != ':':
+                raise self.error('expected : after {!r}'.format(key), self.start(match))
+            items[key] = self.value()
+            match = self.next()
+            if match.group(4) == '}':
+                return items
+            if match.group(4) != ',':
+                raise self.error('expected , or } in dict', self.start(match))
+
+    def parse(self):
+        result = self.value()
+        end = SPACE.match(self.text, self.position).end()
+        if end != len(self.text):
+            raise self.error('unexpected {!r} after the value'.format(self.text[end]), end)
+        return result
+
+
+def parse_literal(text, path=None, line=None):
+    # Lists, dicts, quoted strings and whole numbers only, nothing in the text is ever run
+    if STRING_LIST.fullmatch(text):
+        return [unescape(single or double) for single, double in STRINGS.findall(text)]
+    if NUMBER_DICT.fullmatch(text):
+        return {unescape(single or double): int(number) for single, double, number in PAIRS.findall(text)}
+    return Parser(text, path, line).parse()
@@ -0,0 +1,77 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from scripts.builder import Builder, LOCATION_PATH, ENEMY_PATH, ITEM_PATH
+
+
+# Files handed to a thread at a time, enough to keep the pool overhead small next to the reads
+CHUNK_SIZE = 64
+
+
+def default_workers():
+    # Opening files mostly waits on the disk, so more threads than cores still helps
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+class Loader():
+    def __init__(self, builder=None, workers=None, chunk_size=CHUNK_SIZE) -> None:
+        self.builder = builder if builder is not None else Builder()
+        self.workers = workers if workers is not None else default_workers()
+        self.chunk_size = chunk_size
+        self.timings = {}
+
+    def chunks(self, files):
+        for start in range(0, len(files), self.chunk_size):
+            yield files[start:start + self.chunk_size]
+
+    def build_chunk(self, build, chunk):
+        # Errors are handed back rather than reported here so they come out in file order
+        results = []
+        for filepath, filename in chunk:
+            problems = []
+            try:
+                results.append((filepath, build(filepath, filename, problems), problems, None))
+            except Exception as e:
+                results.append((filepath, None, problems, e))
+        return results
+
+    def build_all(self, executor, build, files):
+        # map keeps the order the files were listed in, whichever thread finishes first
+        built = []
+        for results in executor.map(lambda chunk: self.build_chunk(build, chunk), self.chunks(files)):
+            for filepath, value, problems, error in results:
+                if error is not None:
+                    self.builder.report_error(filepath, error)
+                    continue
+                self.builder.report_problems(filepath, problems)
+                built.append(value)
+        return built
+
+    def load(self):
+        self.timings = {}
+        start = time.perf_counter()
+
+        # Every tree is listed once up front, in the same order the Builder walks it
+        location_files = self.builder.list_files(LOCATION_PATH)
+        enemy_files = self.builder.list_files(ENEMY_PATH)
+        item_files = self.builder.list_files(ITEM_PATH)
+        self.timings['list'] = time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            phase = time.perf_counter()
+            area_list = self.build_all(executor, self.builder.build_area, location_files)
+            self.timings['locations'] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            enemy_list = self.build_all(executor, self.builder.build_enemy, enemy_files)
+            self.timings['enemies'] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            item_list = self.build_all(executor, self.builder.build_item, item_files)
+            self.timings['items'] = time.perf_counter() - phase
+
+        self.timings['total'] = time.perf_counter() - start
+        return area_list, enemy_list, item_list
+
+    def report(self):
+        return ['{:<10} {:>8.3f}s'.format(phase, seconds) for phase, seconds in self.timings.items()]
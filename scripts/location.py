@@ -1,10 +1,17 @@
+from scripts.description import DESCRIPTIONS
+
+
 class Location():
+    __slots__ = ('_name', '_description', 'connections', 'travel_time', 'enemies')
+
     def __init__(self) -> None:
         self._name = 'Unset'
+        # Either the text itself or a source to read it from on demand
         self._description = ''
-        self.connections = []
+        # Tuples, a loaded location never changes them and they are smaller than lists
+        self.connections = ()
         self.travel_time = 1
-        self.enemies = []
+        self.enemies = ()
 
     @property
     def name(self):
@@ -17,17 +24,30 @@ class Location():
 
     @property
     def description(self):
-        return self._description
+        if isinstance(self._description, str):
+            return self._description
+        return DESCRIPTIONS.get(self._description)
 
     @description.setter
     def description(self, value):
+        self._description = self.description
         for i in value:
             self._description += i + '\n'
 
+    @property
+    def description_source(self):
+        if isinstance(self._description, str):
+            return None
+        return self._description
+
+    @description_source.setter
+    def description_source(self, value):
+        self._description = '' if value is None else value
+
     def build_connection(self, area):
         # print('Adding connection {}'.format(area))
         if area not in self.connections:
-            self.connections.append(area)
+            self.connections += (area,)
             # print('No conflicts, connection {} appended'.format(area))
         else:
             # print('{} already has a connection with {}'.format(self.name, area))
@@ -38,7 +58,7 @@ class Location():
     
     def add_enemy(self, enemy):
         if enemy not in self.enemies:
-            self.enemies.append(enemy)
+            self.enemies += (enemy,)
         else:
             pass
     
@@ -1,65 +1,105 @@
 import random
+from scripts.registry import normalize, UnknownNameError
+from scripts.output import say
+
+
+# Players only ever get one of each of these, anything else can drop again
+UNIQUE_TYPES = ['weapon', 'armor', 'trinket']
+
+
+class LootTable():
+    def __init__(self, items, weights=None) -> None:
+        self.items = list(items)
+        if weights is None:
+            weights = [i.drop_weight for i in self.items]
+
+        # Vose's alias method: each column holds its own item up to probability, the alias otherwise
+        count = len(self.items)
+        total = sum(weights)
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        if not count or total <= 0:
+            return
+
+        scaled = [w * count / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rng=random):
+        if not self.items:
+            return None
+        roll = rng.random() * len(self.items)
+        column = int(roll)
+        if roll - column < self.probability[column]:
+            return self.items[column]
+        return self.items[self.alias[column]]
 
 
 class Loot():
     def __init__(self) -> None:
         self.all_items = []
+        self.registry = None
+        self.tables = {}
+        self.repeat_tables = {}
+        self.repeat_fallback = LootTable([])
+        # Extra rolls made because a unique drop was already owned, shared by every world using this loot
+        self.rerolls = 0
 
     def set_items(self, value):
         self.all_items = value
 
-    def get_drop_by_area(self, player, area):
-        pool = []
-        # print('Building the drop pool')
-        for i, v in enumerate(self.all_items):
-            # print('Checking {} which drops in {} against {}'.format(v.name, v.spawn_location, area))
-            
-            if area in v.spawn_location or 'global' in v.spawn_location[0]:
-                # print('{} drops in {}, adding to drop pool\n'.format(v.name, area))
-                pool.append(v)
-        
-        # if pool:
-            # print('\nDrop pool built\n')
-        # else:
-            # print('\nDrop pool failed to build\n')
-
-        drop = self.all_items[0]
-        searching = True
-        while searching:
-            # print('Rolling on drop pool')
-            checked = pool
-            choice = random.choice(pool)
-            # print('Chose {} from drop pool'.format(choice.name))
-            # print('Checking type {} against type rules'.format(choice.type))
-
-            if choice.type in ['weapon', 'armor']:
-                # print('Choice follows weapon and armor rules')
-                if choice not in player.inventory.owned_items:
-                    # print('Player does not already own {}'.format(choice.name))
-                    drop = choice
-                    break
-                else: 
-                    # print('Player already owns {}'.format(choice.name))
-                    checked.remove(choice)
-            
-            elif choice.type == 'trinket':
-                # print('Choice follows trinket rules')
-                if choice not in player.inventory.owned_items:
-                    # print('Player does not already own {}'.format(choice.name))
-                    drop = choice
-                    break
-                else:
-                    # print('Player already owns {}'.format(choice.name))
-                    checked.remove(choice)
-
-            elif choice.type in ['crafting', 'wealth']:
-                # print('Choice follows crafting and wealth rules')
-                drop = choice
-                break
-            
-            if not checked:
-                # print('Pool exhausted and drop rules could not be satisfied\nUsing full item list!')
-                pool = self.all_items
+    def set_registry(self, value):
+        self.registry = value
+        self.build_tables()
+
+    def build_tables(self):
+        self.tables = {}
+        self.repeat_tables = {}
+        self.build_fallback()
+        for area in self.registry.drop_pools:
+            self.build_area_tables(area)
+
+    def build_area_tables(self, area):
+        pool = self.registry.drop_pools[area]
+        self.tables[area] = LootTable(pool)
+        repeatable = [i for i in pool if i.type not in UNIQUE_TYPES]
+        # Areas without repeatable drops of their own reroll on the fallback, so a reroll is always one draw
+        self.repeat_tables[area] = LootTable(repeatable) if repeatable else self.repeat_fallback
+
+    def build_fallback(self):
+        old = self.repeat_fallback
+        self.repeat_fallback = LootTable([i for i in self.all_items if i.type not in UNIQUE_TYPES])
+        for area, table in self.repeat_tables.items():
+            if table is old:
+                self.repeat_tables[area] = self.repeat_fallback
+
+    def get_drop_by_area(self, player, area, rng=random):
+        key = normalize(area)
+        if key not in self.tables:
+            raise UnknownNameError('location', area)
+
+        drop = self.tables[key].sample(rng)
+        # print('Chose {} from drop pool'.format(drop.name))
+
+        if drop.type in UNIQUE_TYPES and player.inventory.owns(drop):
+            # print('Player already owns {}, rerolling on repeatable drops'.format(drop.name))
+            self.rerolls += 1
+            reroll = self.repeat_tables[key].sample(rng)
+            if reroll is not None:
+                drop = reroll
 
         return drop
 
@@ -71,4 +111,4 @@ class Loot():
 
     def add_item_to_inventory(self, player, item):
         player.inventory.add_to_stored_items(item)
-        print('You have added a {} to your bag.\n'.format(item.name))
\ No newline at end of file
+        say('You have added a {} to your bag.\n', item.name)
\ No newline at end of file
@@ -0,0 +1,136 @@
+import atexit
+import sys
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+
+
+# Characters a terminal sink holds before writing them out on its own
+BUFFER_SIZE = 8 * 1024
+
+
+class BufferedSink(ABC):
+    enabled = True
+
+    def __init__(self, buffer_size=None) -> None:
+        self.buffer_size = buffer_size
+        self.pending = []
+        self.size = 0
+
+    def emit(self, text, args):
+        if args:
+            text = text.format(*args)
+        self.write(text + '\n')
+
+    def write(self, text):
+        self.pending.append(text)
+        self.size += len(text)
+        if self.buffer_size is not None and self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            text = ''.join(self.pending)
+            self.pending.clear()
+            self.size = 0
+            self.send(text)
+
+    @abstractmethod
+    def send(self, text):
+        # Writes out one flushed batch, each sink knows where its text goes
+        pass
+
+
+class TerminalSink(BufferedSink):
+    def __init__(self, stream=None, buffer_size=BUFFER_SIZE) -> None:
+        super().__init__(buffer_size)
+        # None looks up sys.stdout when writing, so redirect_stdout still works
+        self.stream = stream
+
+    def send(self, text):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+class SessionSink(BufferedSink):
+    def __init__(self, writer) -> None:
+        # Only sent when the session flushes, so a whole screen goes out in one write
+        super().__init__()
+        self.writer = writer
+
+    def send(self, text):
+        self.writer.write(text.encode('utf-8'))
+
+
+class EventSink():
+    enabled = True
+
+    def __init__(self) -> None:
+        # Messages are kept as (text, args) and only formatted when read back
+        self.events = []
+
+    def emit(self, text, args):
+        self.events.append((text, args))
+
+    def write(self, text):
+        self.events.append((text, ()))
+
+    def flush(self):
+        pass
+
+    def lines(self):
+        return [text.format(*args) if args else text for text, args in self.events]
+
+    def clear(self):
+        self.events.clear()
+
+
+class NullSink():
+    enabled = False
+
+    def emit(self, text, args):
+        pass
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+TERMINAL = TerminalSink()
+atexit.register(TERMINAL.flush)
+
+# Where game text goes for the current session
+_sink = ContextVar('sink', default=TERMINAL)
+
+
+def say(text='', *args):
+    # Arguments are only formatted into the text if the sink is going to use it
+    sink = _sink.get()
+    if sink.enabled:
+        sink.emit(text, args)
+
+
+def warn(text='', *args):
+    # Problems go out straight away, along with anything said before them, rather than waiting in the buffer
+    sink = _sink.get()
+    if sink.enabled:
+        sink.emit(text, args)
+        sink.flush()
+
+
+def flush():
+    _sink.get().flush()
+
+
+def current_sink():
+    return _sink.get()
+
+
+def use_sink(sink):
+    return _sink.set(sink)
+
+
+def reset_sink(token):
+    _sink.reset(token)
@@ -0,0 +1,196 @@
+import json
+import mmap
+import os
+import struct
+from scripts.location import Location
+from scripts.enemy import EnemyTemplate
+from scripts.item import Item
+from scripts.description import PackDescription
+from scripts.registry import normalize, UnknownNameError
+from scripts.sources import hash_file, source_files, source_manifest, file_stat
+
+
+PACK_PATH = 'assets/content.pack'
+PACK_MAGIC = b'MQPK'
+PACK_VERSION = 4
+
+# magic, format version, lengths of the source manifest and of the JSON index that follow the header
+HEADER = struct.Struct('<4sHII')
+
+
+class Pack():
+    def __init__(self, path=PACK_PATH) -> None:
+        self.path = path
+        # The mapped file and the manifest of the sources it was built from, once opened
+        self.data = None
+        self.manifest = None
+        self.built = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def open(self):
+        # The only time the pack file is opened, is_stale and load both read from this map
+        with open(self.path, 'rb') as file:
+            self.built = os.fstat(file.fileno()).st_mtime_ns
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(data) < HEADER.size:
+            data.close()
+            raise ValueError('{} is not a version {} content pack'.format(self.path, PACK_VERSION))
+        magic, version, manifest_length, _ = HEADER.unpack_from(data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            data.close()
+            raise ValueError('{} is not a version {} content pack'.format(self.path, PACK_VERSION))
+
+        self.manifest = json.loads(data[HEADER.size:HEADER.size + manifest_length].decode('utf-8'))
+        self.data = data
+
+    def is_stale(self):
+        if not self.exists():
+            return True
+        if self.data is None:
+            try:
+                self.open()
+            except (OSError, ValueError):
+                return True
+
+        # Added or removed files change the list, edits are found with os.stat alone
+        manifest = self.manifest
+        paths = source_files()
+        if len(paths) != len(manifest):
+            return True
+        for path in paths:
+            entry = manifest.get(path)
+            if entry is None:
+                return True
+            stat = file_stat(path)
+            if stat == entry[:2]:
+                continue
+            if stat[0] > self.built:
+                return True
+            # Moved to an older time, as a checkout or a copy can do, so only the contents can tell
+            if hash_file(path) != entry[2]:
+                return True
+        return False
+
+    def compile(self, builder, strict=True):
+        # Taken before building, so a file edited while compiling leaves the pack stale
+        manifest = source_manifest()
+        blob = bytearray()
+
+        def add_text(owner):
+            # Read straight from the source so compiling does not churn the shared cache
+            if owner.description_source is not None:
+                text = owner.description_source.read()
+            else:
+                text = owner.description
+            data = text.encode('utf-8')
+            offset = len(blob)
+            blob.extend(data)
+            return [offset, len(data)]
+
+        area_list = builder.build_areas()
+        enemy_list = builder.build_enemies()
+        if strict:
+            # Checked before anything is written, so a bad name never makes it into a pack
+            names = set(normalize(enemy.name) for enemy in enemy_list)
+            for location in area_list:
+                for name in location.enemies:
+                    if normalize(name) not in names:
+                        raise UnknownNameError('enemy', name, location.name)
+
+        locations = []
+        for location in area_list:
+            locations.append({
+                'name': location.name,
+                'connections': location.connections,
+                'enemies': location.enemies,
+                'travel_time': location.travel_time,
+                'description': add_text(location),
+            })
+
+        enemies = []
+        for enemy in enemy_list:
+            enemies.append({
+                'name': enemy.name,
+                'level': enemy.level,
+                'attack': enemy.attack,
+                'defense': enemy.defense,
+                'speed': enemy.speed,
+            })
+
+        items = []
+        for item in builder.build_items():
+            items.append({
+                'name': item.name,
+                'type': item.type,
+                'stat_modifiers': item.stat_modifiers,
+                'worth': item.worth,
+                'spawn_location': item.spawn_location,
+                'description': add_text(item),
+            })
+
+        index = json.dumps({'locations': locations, 'enemies': enemies, 'items': items},
+                           separators=(',', ':')).encode('utf-8')
+
+        sources = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+
+        # Descriptions are stored after the index so their offsets are relative to the blob start
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(sources), len(index)))
+            file.write(sources)
+            file.write(index)
+            file.write(blob)
+        os.replace(temp_path, self.path)
+        # Anything still reading the old map keeps it, the next load maps the new file
+        self.data = None
+        self.manifest = None
+
+    def load(self):
+        # The map is left open; descriptions are sliced out of it when first displayed
+        if self.data is None:
+            self.open()
+        data = self.data
+
+        _, _, manifest_length, index_length = HEADER.unpack_from(data, 0)
+        index_start = HEADER.size + manifest_length
+        blob_start = index_start + index_length
+        index = json.loads(data[index_start:blob_start].decode('utf-8'))
+
+        def description(span):
+            offset, length = span
+            return PackDescription(data, blob_start + offset, length)
+
+        area_list = []
+        for record in index['locations']:
+            location = Location()
+            location.name = record['name']
+            location.description_source = description(record['description'])
+            location.travel_time = record['travel_time']
+            for i in record['connections']:
+                location.build_connection(i)
+            for e in record['enemies']:
+                location.add_enemy(e)
+            area_list.append(location)
+
+        enemy_list = []
+        for record in index['enemies']:
+            enemy = EnemyTemplate(record['name'], record['level'], record['attack'], record['defense'], record['speed'])
+            enemy_list.append(enemy)
+
+        item_list = []
+        for record in index['items']:
+            item = Item()
+            item.name = record['name']
+            item.type = record['type']
+            item.description_source = description(record['description'])
+            item.spawn_location = record['spawn_location']
+            if item.type == 'wealth':
+                item.worth = record['worth']
+            else:
+                item.stat_modifiers = record['stat_modifiers']
+            item_list.append(item)
+
+        return area_list, enemy_list, item_list
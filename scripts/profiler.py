@@ -0,0 +1,249 @@
+import functools
+import json
+import os
+import threading
+import time
+from scripts.builder import Builder
+from scripts.combat import Combat
+from scripts.entity import Entity
+from scripts.loader import Loader
+from scripts.loot import Loot
+from scripts.world import World
+
+
+# Trace events kept before the oldest are dropped, about 100 bytes each
+MAX_EVENTS = 1000000
+# Slowest details listed per section in the text report
+TOP_DETAILS = 5
+
+METRIC_PREFIX = 'miniquest'
+
+# The profiler that currently has its hooks installed, there can only be one
+_active = None
+
+
+def describe_path(args):
+    # Per-file builders are called as (self, filepath, filename, problems)
+    return args[1]
+
+
+def describe_phase(args):
+    # build_all is called as (self, path, build) on the Builder and (self, executor, build, files) on the Loader
+    build = args[2]
+    return getattr(build, '__name__', str(build))
+
+
+def describe_state(args):
+    return args[0].state
+
+
+class Section():
+    __slots__ = ('count', 'total', 'low', 'high', 'details')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.low = None
+        self.high = 0
+        # Total time per file, phase or state, when the hook says what it was working on
+        self.details = {}
+
+    def add(self, elapsed, detail=None):
+        self.count += 1
+        self.total += elapsed
+        if self.low is None or elapsed < self.low:
+            self.low = elapsed
+        if elapsed > self.high:
+            self.high = elapsed
+        if detail is not None:
+            self.details[detail] = self.details.get(detail, 0) + elapsed
+
+
+class Profiler():
+    # Hooks are only installed while enabled, with it off every method is the original and costs nothing extra
+    def __init__(self, trace=False, max_events=MAX_EVENTS) -> None:
+        self.trace = trace
+        self.max_events = max_events
+        self.sections = {}
+        self.counters = {}
+        self.events = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.patched = []
+        self.started = time.perf_counter_ns()
+
+    @property
+    def enabled(self):
+        return _active is self
+
+    def enable(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError('A profiler is already enabled')
+        _active = self
+
+        self.time(World, 'step', 'world.step', describe_state)
+        self.time(Entity, 'update_stats', 'entity.update_stats')
+        self.time(Combat, 'start_combat', 'combat.start')
+        self.time(Combat, 'player_turn', 'combat.player_turn')
+        self.time(Combat, 'enemy_turn', 'combat.enemy_turn')
+        self.time(Builder, 'build_all', 'builder.phase', describe_phase)
+        self.time(Builder, 'build_area', 'builder.location', describe_path)
+        self.time(Builder, 'build_enemy', 'builder.enemy', describe_path)
+        self.time(Builder, 'build_item', 'builder.item', describe_path)
+        self.time(Loader, 'build_all', 'loader.phase', describe_phase)
+        self.patch(Loot, 'get_drop_by_area', self.time_drop)
+        return self
+
+    def disable(self):
+        global _active
+        for owner, name, original in reversed(self.patched):
+            setattr(owner, name, original)
+        self.patched = []
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def patch(self, owner, name, make):
+        original = owner.__dict__[name]
+        self.patched.append((owner, name, original))
+        setattr(owner, name, functools.wraps(original)(make(original)))
+
+    def time(self, owner, name, section, describe=None):
+        record = self.record
+        clock = time.perf_counter_ns
+
+        def make(function):
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    record(section, start, clock(), describe(args) if describe is not None else None)
+            return timed
+
+        self.patch(owner, name, make)
+
+    def time_drop(self, function):
+        record = self.record
+        count = self.count
+        clock = time.perf_counter_ns
+
+        def timed(loot, *args, **kwargs):
+            rerolls = loot.rerolls
+            start = clock()
+            try:
+                return function(loot, *args, **kwargs)
+            finally:
+                end = clock()
+                rerolls = loot.rerolls - rerolls
+                record('loot.drop', start, end, '{} rerolls'.format(rerolls))
+                count('loot.rerolls', rerolls)
+        return timed
+
+    def record(self, section, start, end, detail=None):
+        elapsed = end - start
+        with self.lock:
+            stats = self.sections.get(section)
+            if stats is None:
+                stats = self.sections[section] = Section()
+            stats.add(elapsed, detail)
+
+            if self.trace:
+                if len(self.events) >= self.max_events:
+                    self.dropped += 1
+                    return
+                self.events.append((section, start, elapsed, threading.get_ident(), detail))
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def clear(self):
+        with self.lock:
+            self.sections = {}
+            self.counters = {}
+            self.events = []
+            self.dropped = 0
+            self.started = time.perf_counter_ns()
+
+    def report(self):
+        lines = ['{:<24} {:>9} {:>11} {:>10} {:>10} {:>10}'.format(
+            'section', 'calls', 'total ms', 'mean us', 'min us', 'max us')]
+        for name, stats in sorted(self.sections.items(), key=lambda item: -item[1].total):
+            lines.append('{:<24} {:>9} {:>11.2f} {:>10.2f} {:>10.2f} {:>10.2f}'.format(
+                name, stats.count, stats.total / 1e6, stats.total / stats.count / 1e3,
+                stats.low / 1e3, stats.high / 1e3))
+            slowest = sorted(stats.details.items(), key=lambda item: -item[1])[:TOP_DETAILS]
+            for detail, total in slowest:
+                lines.append('    {:<40} {:>11.2f}'.format(str(detail)[-40:], total / 1e6))
+        for name, value in sorted(self.counters.items()):
+            lines.append('{:<24} {:>9}'.format(name, value))
+        if self.dropped:
+            lines.append('{} trace events were dropped after the first {}'.format(self.dropped, self.max_events))
+        return lines
+
+    def trace_events(self):
+        # Chrome's trace event format, complete events with times in microseconds
+        pid = os.getpid()
+        events = []
+        for section, start, elapsed, thread, detail in self.events:
+            event = {
+                'name': section,
+                'cat': section.split('.')[0],
+                'ph': 'X',
+                'ts': (start - self.started) / 1e3,
+                'dur': elapsed / 1e3,
+                'pid': pid,
+                'tid': thread,
+            }
+            if detail is not None:
+                event['args'] = {'detail': str(detail)}
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.trace_events(), file, separators=(',', ':'))
+
+    def metrics(self):
+        # Prometheus text exposition format, sections are labels on a few shared metrics
+        lines = [
+            '# HELP {}_section_calls_total Calls to each instrumented section'.format(METRIC_PREFIX),
+            '# TYPE {}_section_calls_total counter'.format(METRIC_PREFIX),
+        ]
+        for name, stats in sorted(self.sections.items()):
+            lines.append('{}_section_calls_total{{section="{}"}} {}'.format(METRIC_PREFIX, name, stats.count))
+        lines.extend([
+            '# HELP {}_section_seconds_total Time spent in each instrumented section'.format(METRIC_PREFIX),
+            '# TYPE {}_section_seconds_total counter'.format(METRIC_PREFIX),
+        ])
+        for name, stats in sorted(self.sections.items()):
+            lines.append('{}_section_seconds_total{{section="{}"}} {:.9f}'.format(METRIC_PREFIX, name, stats.total / 1e9))
+        lines.extend([
+            '# HELP {}_section_max_seconds Slowest single call to each instrumented section'.format(METRIC_PREFIX),
+            '# TYPE {}_section_max_seconds gauge'.format(METRIC_PREFIX),
+        ])
+        for name, stats in sorted(self.sections.items()):
+            lines.append('{}_section_max_seconds{{section="{}"}} {:.9f}'.format(METRIC_PREFIX, name, stats.high / 1e9))
+        for name, value in sorted(self.counters.items()):
+            metric = '{}_{}_total'.format(METRIC_PREFIX, name.replace('.', '_'))
+            lines.append('# TYPE {} counter'.format(metric))
+            lines.append('{} {}'.format(metric, value))
+        return lines
+
+    def write_metrics(self, path):
+        # Written to a temporary file first so a scraper never reads half a file
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            file.write('\n'.join(self.metrics()) + '\n')
+        os.replace(temp_path, path)
+
+
+def active():
+    return _active
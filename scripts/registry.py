@@ -0,0 +1,126 @@
+from scripts.output import warn
+
+
+def normalize(name):
+    return name.removesuffix('.txt').strip().lower()
+
+
+def is_global(item):
+    return not item.spawn_location or 'global' in item.spawn_location[0]
+
+
+class UnknownNameError(LookupError):
+    def __init__(self, kind, name, owner=None) -> None:
+        if owner is None:
+            super().__init__('No {} named {!r}'.format(kind, name))
+        else:
+            super().__init__('No {} named {!r}, listed by {}'.format(kind, name, owner))
+        self.kind = kind
+        self.name = name
+        self.owner = owner
+
+
+class Registry():
+    def __init__(self, area_list, enemy_list, item_list, strict=True) -> None:
+        # Lenient registries skip names that match nothing instead of raising, for hot reload
+        self.strict = strict
+        self.locations = {}
+        self.enemies = {}
+        self.items = {}
+
+        self.global_drops = []
+        self.drop_pools = {}
+        self.enemy_pools = {}
+        # Enemy names a location lists that match no enemy, left out of its pool when lenient
+        self.unresolved = {}
+
+        self.build(area_list, enemy_list, item_list)
+
+    def rebuild(self, area_list, enemy_list, item_list):
+        # Cleared in place so everything holding this registry sees the new content
+        for index in [self.locations, self.enemies, self.items, self.drop_pools, self.enemy_pools,
+                      self.unresolved]:
+            index.clear()
+        self.global_drops.clear()
+        self.build(area_list, enemy_list, item_list)
+
+    def build(self, area_list, enemy_list, item_list):
+        for location in area_list:
+            self.locations[normalize(location.name)] = location
+
+        for enemy in enemy_list:
+            self.enemies[normalize(enemy.name)] = enemy
+
+        for item in item_list:
+            self.items[normalize(item.name)] = item
+
+        for key, location in self.locations.items():
+            self.drop_pools[key] = []
+            self.enemy_pools[key] = self.resolve_enemies(key, location)
+
+        # Pools keep the item list order, global drops included in every area
+        for item in item_list:
+            if is_global(item):
+                self.global_drops.append(item)
+                for pool in self.drop_pools.values():
+                    pool.append(item)
+            else:
+                for area in item.spawn_location:
+                    pool = self.drop_pools.get(normalize(area))
+                    if pool is not None and (not pool or pool[-1] is not item):
+                        pool.append(item)
+
+    def resolve_enemies(self, key, location):
+        # When lenient a misspelled name only costs that entry, the validator lists them all
+        pool = []
+        missing = []
+        for name in location.enemies:
+            enemy = self.enemies.get(normalize(name))
+            if enemy is None:
+                if self.strict:
+                    raise UnknownNameError('enemy', name, location.name)
+                warn('{} lists enemy {}, which does not exist', location.name, name)
+                missing.append(name)
+            else:
+                pool.append(enemy)
+        if missing:
+            self.unresolved[key] = missing
+        else:
+            self.unresolved.pop(key, None)
+        return pool
+
+    def drop_areas(self, item):
+        # Keys of every drop pool the item belongs in
+        if is_global(item):
+            return list(self.drop_pools)
+        return [key for key in dict.fromkeys(normalize(area) for area in item.spawn_location) if key in self.drop_pools]
+
+    def location(self, name):
+        try:
+            return self.locations[normalize(name)]
+        except KeyError:
+            raise UnknownNameError('location', name) from None
+
+    def enemy(self, name):
+        try:
+            return self.enemies[normalize(name)]
+        except KeyError:
+            raise UnknownNameError('enemy', name) from None
+
+    def item(self, name):
+        try:
+            return self.items[normalize(name)]
+        except KeyError:
+            raise UnknownNameError('item', name) from None
+
+    def drop_pool(self, area):
+        try:
+            return self.drop_pools[normalize(area)]
+        except KeyError:
+            raise UnknownNameError('location', area) from None
+
+    def enemy_pool(self, area):
+        try:
+            return self.enemy_pools[normalize(area)]
+        except KeyError:
+            raise UnknownNameError('location', area) from None
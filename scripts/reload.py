@@ -0,0 +1,278 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from scripts.builder import Builder, LOCATION_PATH, ENEMY_PATH, ITEM_PATH
+from scripts.description import DESCRIPTIONS
+from scripts.item import Item, bump_stat_generation
+from scripts.location import Location
+from scripts.loot import UNIQUE_TYPES
+from scripts.registry import normalize, is_global
+
+
+WATCH_PATHS = [LOCATION_PATH, ENEMY_PATH, ITEM_PATH]
+POLL_INTERVAL = 1.0
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher():
+    def __init__(self, paths=WATCH_PATHS) -> None:
+        name = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(name or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories = {}
+        for path in paths:
+            for dirpath, _, _ in os.walk(path):
+                self.watch(dirpath)
+
+    def watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed for {}'.format(path))
+        self.directories[wd] = path
+
+    def fileno(self):
+        return self.fd
+
+    def changes(self, timeout=None):
+        # Blocks up to timeout for the first event, then returns every changed file path
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        changed = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.watch(path)
+                continue
+            if path not in changed:
+                changed.append(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher():
+    def __init__(self, paths=WATCH_PATHS, interval=POLL_INTERVAL) -> None:
+        self.paths = paths
+        self.interval = interval
+        self.seen = self.snapshot()
+
+    def snapshot(self):
+        seen = {}
+        for path in self.paths:
+            for dirpath, _, filenames in os.walk(path):
+                for filename in filenames:
+                    filepath = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(filepath)
+                    except FileNotFoundError:
+                        continue
+                    seen[filepath] = (stat.st_mtime_ns, stat.st_size)
+        return seen
+
+    def fileno(self):
+        return None
+
+    def changes(self, timeout=None):
+        if timeout is not None:
+            time.sleep(min(timeout, self.interval))
+        seen = self.snapshot()
+        changed = [path for path, stat in seen.items() if self.seen.get(path) != stat]
+        changed.extend(path for path in self.seen if path not in seen)
+        self.seen = seen
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths=WATCH_PATHS):
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError):
+        # No inotify on this platform, fall back to comparing mtimes
+        return PollingWatcher(paths)
+
+
+def copy_slots(cls, source, target):
+    for slot in cls.__slots__:
+        setattr(target, slot, getattr(source, slot))
+
+
+class Reloader():
+    def __init__(self, content, builder=None) -> None:
+        self.content = content
+        self.builder = builder if builder is not None else Builder()
+        self.timings = []
+
+    def kind(self, path):
+        path = os.path.normpath(path)
+        for kind, root in [('location', LOCATION_PATH), ('enemy', ENEMY_PATH), ('item', ITEM_PATH)]:
+            if path.startswith(os.path.normpath(root) + os.sep):
+                return kind
+        return None
+
+    def reload(self, path):
+        # Returns True when the content changed, False when the file could not be used
+        if not path.endswith('.txt'):
+            return False
+        kind = self.kind(path)
+        if kind is None:
+            return False
+
+        start = time.perf_counter()
+        filename = os.path.basename(path)
+        key = normalize(filename)
+        built = None
+        problems = []
+        try:
+            if os.path.exists(path):
+                build = {'location': self.builder.build_area, 'enemy': self.builder.build_enemy,
+                         'item': self.builder.build_item}[kind]
+                built = build(path, filename, problems)
+
+            if kind == 'location':
+                self.reload_location(key, built)
+            elif kind == 'enemy':
+                self.reload_enemy(key, built)
+            else:
+                self.reload_item(key, built)
+        except Exception as e:
+            # Nothing is patched before the new version has been checked, so the old one stays in play
+            self.builder.report_error(path, e)
+            return False
+        self.builder.report_problems(path, problems)
+        self.content.forget_sources()
+
+        self.timings.append((path, time.perf_counter() - start))
+        return True
+
+    def restructure(self, things, old, new):
+        # Files being added or removed change list positions, so every index is rebuilt
+        if old is not None:
+            index = things.index(old)
+            things.pop(index)
+        if new is not None:
+            things.append(new)
+        try:
+            self.content.rebuild()
+        except Exception:
+            # Such as removing an enemy a location still lists from strict content, lenient content
+            # only warns about it. Either way the tree goes back to how it was
+            if new is not None:
+                things.pop()
+            if old is not None:
+                things.insert(index, old)
+            self.content.rebuild()
+            raise
+
+    def reload_location(self, key, new):
+        registry = self.content.registry
+        old = registry.locations.get(key)
+        if old is None or new is None:
+            self.restructure(self.content.area_list, old, new)
+            return
+
+        # Patched in place, so players standing here see the change straight away
+        pool = registry.resolve_enemies(key, new)
+        moved = old.connections != new.connections or old.travel_time != new.travel_time
+        if old.description_source is not None:
+            DESCRIPTIONS.forget(old.description_source)
+        copy_slots(Location, new, old)
+
+        registry.enemy_pools[key] = pool
+        if moved:
+            self.content.graph.build(self.content.area_list)
+
+    def reload_enemy(self, key, new):
+        registry = self.content.registry
+        old = registry.enemies.get(key)
+        if old is None or new is None:
+            self.restructure(self.content.enemy_list, old, new)
+            return
+
+        # Templates are frozen, the new one takes the old one's place and fights in progress keep theirs
+        enemy_list = self.content.enemy_list
+        enemy_list[enemy_list.index(old)] = new
+        registry.enemies[key] = new
+        for pool in registry.enemy_pools.values():
+            for i, template in enumerate(pool):
+                if template is old:
+                    pool[i] = new
+
+    def reload_item(self, key, new):
+        registry = self.content.registry
+        loot = self.content.loot
+        old = registry.items.get(key)
+        if old is None or new is None:
+            self.restructure(self.content.all_items, old, new)
+            return
+
+        old_areas = registry.drop_areas(old)
+        repeatable = old.type not in UNIQUE_TYPES
+        restat = old.stat_modifiers != new.stat_modifiers
+        if old.description_source is not None:
+            DESCRIPTIONS.forget(old.description_source)
+
+        # Patched in place, so bags and equipped gear holding the item see the change
+        copy_slots(Item, new, old)
+        new_areas = registry.drop_areas(old)
+
+        for area in old_areas:
+            if area not in new_areas:
+                registry.drop_pools[area].remove(old)
+        for area in new_areas:
+            if old not in registry.drop_pools[area]:
+                registry.drop_pools[area].append(old)
+        if is_global(old) and old not in registry.global_drops:
+            registry.global_drops.append(old)
+        elif not is_global(old) and old in registry.global_drops:
+            registry.global_drops.remove(old)
+
+        for area in dict.fromkeys(old_areas + new_areas):
+            loot.build_area_tables(area)
+        if repeatable or old.type not in UNIQUE_TYPES:
+            loot.build_fallback()
+        if restat:
+            bump_stat_generation()
+
+    def watch(self, watcher, timeout=None):
+        # One round of waiting for changes and applying them, returns the paths that were reloaded
+        reloaded = []
+        for path in watcher.changes(timeout):
+            if self.reload(path):
+                reloaded.append(path)
+        return reloaded
@@ -0,0 +1,216 @@
+import os
+import struct
+from bisect import bisect_right
+from scripts.output import NullSink, say, use_sink, reset_sink
+from scripts.world import World, STATES, AREA
+from scripts.scheduler import Roster
+from scripts import save
+
+
+LOG_MAGIC = b'MQLG'
+LOG_VERSION = 2
+
+# A snapshot is taken at the first location menu after this many events
+SNAPSHOT_INTERVAL = 256
+
+# magic, format version, dice seed, digest of the asset files the session was played with
+HEADER = struct.Struct('<4sHQ20s')
+# The part of the header every version of the log starts with
+PREFIX = struct.Struct('<4sH')
+# record kind, state the input was given in, dice rolls it used, length of the line
+EVENT = struct.Struct('<BBIH')
+# record kind, events before it, state it resumes in, length of the dice state, length of the save
+SNAPSHOT = struct.Struct('<BIBII')
+# record kind, events before it, hours the server moved the character on while it sat at the location menu
+IDLE = struct.Struct('<BII')
+
+EVENT_RECORD = 1
+SNAPSHOT_RECORD = 2
+IDLE_RECORD = 3
+
+STATE_CODES = {state: i for i, state in enumerate(STATES)}
+
+
+class ReplayError(ValueError):
+    def __init__(self, index, message) -> None:
+        super().__init__('event {}: {}'.format(index, message))
+        self.index = index
+
+
+class EventLog():
+    def __init__(self, path, seed, digest, snapshot_interval=SNAPSHOT_INTERVAL) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(LOG_MAGIC, LOG_VERSION, seed, bytes.fromhex(digest)))
+        self.snapshot_interval = snapshot_interval
+        self.events = 0
+        self.last_snapshot = 0
+        self.draws = 0
+
+    @classmethod
+    def attach(cls, world, path, snapshot_interval=SNAPSHOT_INTERVAL):
+        # Must happen before the first step, the log starts from the seed
+        world.log = cls(path, world.rng.seed, world.content.digest(), snapshot_interval)
+        return world.log
+
+    def record(self, world, line, state):
+        data = line.encode('utf-8')
+        draws = world.rng.draws()
+        self.file.write(EVENT.pack(EVENT_RECORD, STATE_CODES[world.state], draws - self.draws, len(data)))
+        self.file.write(data)
+        self.draws = draws
+        self.events += 1
+
+        # Only the location menu is snapshotted, there is no fight or open bag to carry over
+        if state == AREA and world.combat is None and self.events - self.last_snapshot >= self.snapshot_interval:
+            self.snapshot(world, state)
+
+        # Written through so a crash loses at most the line being handled
+        self.file.flush()
+
+    def idle(self, hours):
+        self.file.write(IDLE.pack(IDLE_RECORD, self.events, hours))
+        self.file.flush()
+
+    def snapshot(self, world, state):
+        dice = world.rng.dumps()
+        game = save.dumps(world)
+        self.file.write(SNAPSHOT.pack(SNAPSHOT_RECORD, self.events, STATE_CODES[state], len(dice), len(game)))
+        self.file.write(dice)
+        self.file.write(game)
+        self.last_snapshot = self.events
+
+    def close(self):
+        self.file.close()
+
+
+class Replay():
+    def __init__(self, content, path) -> None:
+        self.content = content
+        self.path = path
+        self.seed = None
+        # (state code, rolls used, line) per event
+        self.events = []
+        # (events before it, state code, dice state, save), in log order
+        self.snapshots = []
+        self.snapshot_indexes = []
+        # (events before it, hours), in log order
+        self.idles = []
+        self.read()
+
+    def read(self):
+        with open(self.path, 'rb') as file:
+            data = file.read()
+
+        if len(data) < PREFIX.size:
+            raise ValueError('{} is not a MiniQuest event log'.format(self.path))
+        magic, version = PREFIX.unpack_from(data, 0)
+        if magic != LOG_MAGIC or (version == LOG_VERSION and len(data) < HEADER.size):
+            raise ValueError('{} is not a MiniQuest event log'.format(self.path))
+        if version != LOG_VERSION:
+            raise ValueError('{} is a version {} event log, this game reads version {}'.format(
+                self.path, version, LOG_VERSION))
+        _, _, self.seed, digest = HEADER.unpack_from(data, 0)
+        # Checked up front, different assets would only show up partway through as a mismatched event
+        if digest.hex() != self.content.digest():
+            raise ValueError('{} was recorded with different asset files, it only replays against the same content'.format(
+                self.path))
+
+        offset = HEADER.size
+        events = self.events
+        # A record cut short by a crash ends the log, everything before it still replays
+        while offset < len(data):
+            kind = data[offset]
+            if kind == EVENT_RECORD:
+                if offset + EVENT.size > len(data):
+                    break
+                _, state, draws, length = EVENT.unpack_from(data, offset)
+                start = offset + EVENT.size
+                if start + length > len(data):
+                    break
+                events.append((state, draws, data[start:start + length].decode('utf-8')))
+                offset = start + length
+            elif kind == SNAPSHOT_RECORD:
+                if offset + SNAPSHOT.size > len(data):
+                    break
+                _, index, state, dice_length, game_length = SNAPSHOT.unpack_from(data, offset)
+                start = offset + SNAPSHOT.size
+                end = start + dice_length + game_length
+                if end > len(data):
+                    break
+                self.snapshots.append((index, state, data[start:start + dice_length], data[start + dice_length:end]))
+                self.snapshot_indexes.append(index)
+                offset = end
+            elif kind == IDLE_RECORD:
+                if offset + IDLE.size > len(data):
+                    break
+                _, index, hours = IDLE.unpack_from(data, offset)
+                self.idles.append((index, hours))
+                offset += IDLE.size
+            else:
+                raise ValueError('{} has an unknown record at byte {}'.format(self.path, offset))
+
+    def __len__(self):
+        return len(self.events)
+
+    def snapshot_before(self, index):
+        position = bisect_right(self.snapshot_indexes, index)
+        return self.snapshots[position - 1] if position else None
+
+    def world_at(self, index=None, sink=None):
+        # Starts from the latest snapshot at or before index, so seeking only replays what follows it
+        if index is None:
+            index = len(self.events)
+        if not 0 <= index <= len(self.events):
+            raise IndexError('The log has {} events'.format(len(self.events)))
+
+        token = use_sink(sink if sink is not None else NullSink())
+        try:
+            world = World(self.content, self.seed)
+            start = 0
+            snapshot = self.snapshot_before(index)
+            if snapshot is not None:
+                start, state, dice, game = snapshot
+                world.rng.loads(dice)
+                save.loads(world, game)
+                world.state = STATES[state]
+            self.play(world, start, index)
+        finally:
+            reset_sink(token)
+        return world
+
+    def play(self, world, start, stop, transcript=False):
+        # Every event is checked against the log, a mismatch means the content or code has changed since
+        show = world.show
+        step = world.step
+        rng = world.rng
+        draws = rng.draws()
+        # Idle hours logged after the last event replayed still belong to it when the log ends there
+        last = stop + 1 if stop == len(self.events) else stop
+        idles = [(index, hours) for index, hours in self.idles if start <= index < last]
+        idles.reverse()
+        for index in range(start, stop + 1):
+            while idles and idles[-1][0] == index:
+                self.advance(world, idles.pop()[1])
+            if index == stop:
+                break
+            state, used, line = self.events[index]
+            if STATES[state] != world.state:
+                raise ReplayError(index, 'logged in state {} but replayed in {}'.format(STATES[state], world.state))
+            prompt = show()
+            if transcript:
+                say('{}{}', prompt, line)
+            world.state = step(line)
+            total = rng.draws()
+            if total - draws != used:
+                raise ReplayError(index, 'used {} dice rolls, the log has {}'.format(total - draws, used))
+            draws = total
+
+    def advance(self, world, hours):
+        # The same pass the server ran, applied to this one character
+        roster = Roster.from_worlds([world], world.graph)
+        roster.advance(hours)
+        roster.apply([world])
@@ -0,0 +1,231 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain
+from scripts.entity import Entity
+from scripts.registry import normalize
+
+
+SAVE_PATH = 'saves/miniquest.sav'
+SAVE_MAGIC = b'MQSV'
+SAVE_VERSION = 2
+
+# Every field is little-endian, with these limits:
+#   hour and player stats, health and income   signed 32 bit
+#   location and item ids                      unsigned 32 bit crc32 of the name, 0 for an empty slot
+#   world and player names                     up to MAX_NAME bytes of UTF-8 each
+#   item palette                               up to MAX_PALETTE distinct items, one 32 bit id each
+#   bag                                        one unsigned 32 bit count per item, up to MAX_COUNT of each
+#   trinkets and owned items                   unsigned 16 bit indexes into the palette
+
+# magic, format version, then the world: hour, current location, camp
+HEADER = struct.Struct('<4sHiII')
+# level, target, attack, defense, speed, current health, income, then the held and body item or 0
+PLAYER = struct.Struct('<iiiiiiiII')
+# Lengths of the two names, of the item palette, of the bag counts and of the trinket and owned indexes
+LENGTHS = struct.Struct('<HHIIII')
+
+NO_ITEM = 0
+MAX_NAME = 0xffff
+MAX_PALETTE = 0xffff
+MAX_COUNT = 0xffffffff
+
+
+def stable_id(name):
+    # Worked out from the name alone, so saves keep working when files are added or reordered;
+    # 0 stands for an empty slot
+    return zlib.crc32(normalize(name).encode('utf-8')) or 1
+
+
+def build_ids(kind, things):
+    ids = {}
+    for thing in things:
+        key = stable_id(thing.name)
+        other = ids.get(key)
+        if other is not None and normalize(other.name) != normalize(thing.name):
+            raise ValueError('The {}s {} and {} have the same save id, one of them needs renaming'.format(
+                kind, other.name, thing.name))
+        ids[key] = thing
+    return ids
+
+
+class IdTable():
+    def __init__(self, content) -> None:
+        self.locations = build_ids('location', content.area_list)
+        self.enemies = build_ids('enemy', content.enemy_list)
+        self.items = build_ids('item', content.all_items)
+
+        # The other way round, so saving never has to hash a name
+        self.location_keys = {normalize(location.name): key for key, location in self.locations.items()}
+        self.item_keys = {item: key for key, item in self.items.items()}
+
+    def location(self, key):
+        try:
+            return self.locations[key]
+        except KeyError:
+            raise ValueError('The save names a location that no longer exists ({:08x})'.format(key)) from None
+
+    def item(self, key):
+        try:
+            return self.items[key]
+        except KeyError:
+            raise ValueError('The save names an item that no longer exists ({:08x})'.format(key)) from None
+
+
+def to_array(typecode, values):
+    values = array(typecode, values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def read_array(typecode, data, offset, count):
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    values.frombytes(data[offset:end])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values, end
+
+
+def dumps(world):
+    ids = world.content.id_table()
+    item_key = ids.item_keys.__getitem__
+    location_keys = ids.location_keys
+
+    player = world.player
+    inventory = player.inventory
+    equipped = inventory.equipped_items
+
+    # Every distinct item is written once, bag items first and in bag order so the bag is
+    # just a count per leading palette entry, trinkets and owned items are indexes into it
+    palette = list(dict.fromkeys(chain(inventory.stored_items, equipped['Trinkets'], inventory.owned_items)))
+    if len(palette) > MAX_PALETTE:
+        raise ValueError('Too many distinct items to save ({})'.format(len(palette)))
+    index = {item: i for i, item in enumerate(palette)}.__getitem__
+
+    world_name = world.player_name.encode('utf-8')
+    player_name = player.name.encode('utf-8')
+    if max(len(world_name), len(player_name)) > MAX_NAME:
+        raise ValueError('Names over {} bytes cannot be saved'.format(MAX_NAME))
+    keys = to_array('I', list(map(item_key, palette)))
+    stored = list(inventory.stored_items.values())
+    if stored and max(stored) > MAX_COUNT:
+        raise ValueError('Cannot save more than {} of one item'.format(MAX_COUNT))
+    counts = to_array('I', stored)
+    trinkets = to_array('H', list(map(index, equipped['Trinkets'])))
+    owned = to_array('H', list(map(index, inventory.owned_items)))
+
+    held = item_key(equipped['Held']) if equipped['Held'] is not None else NO_ITEM
+    body = item_key(equipped['Body']) if equipped['Body'] is not None else NO_ITEM
+
+    return b''.join([
+        HEADER.pack(SAVE_MAGIC, SAVE_VERSION, world.time,
+                    location_keys[normalize(world.current_area.name)], location_keys[normalize(world.camp)]),
+        PLAYER.pack(player.level, player.target, player.attack, player.defense, player.speed,
+                    player.current_health, inventory.income, held, body),
+        LENGTHS.pack(len(world_name), len(player_name), len(keys), len(counts), len(trinkets), len(owned)),
+        world_name,
+        player_name,
+        keys.tobytes(),
+        counts.tobytes(),
+        trinkets.tobytes(),
+        owned.tobytes(),
+    ])
+
+
+def loads(world, data):
+    # Nothing in the world is touched until the whole save has been read
+    data = memoryview(data)
+    if len(data) < HEADER.size + PLAYER.size + LENGTHS.size:
+        raise ValueError('Not a MiniQuest save')
+    magic, version, hour, area, camp = HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise ValueError('Not a MiniQuest save')
+    if version != SAVE_VERSION:
+        raise ValueError('Save is version {}, this game reads version {}'.format(version, SAVE_VERSION))
+
+    ids = world.content.id_table()
+    offset = HEADER.size
+    level, target, attack, defense, speed, health, income, held, body = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    world_length, player_length, palette_length, stored_length, trinkets_length, owned_length = \
+        LENGTHS.unpack_from(data, offset)
+    offset += LENGTHS.size
+    expected = offset + world_length + player_length + 4 * (palette_length + stored_length) + 2 * (trinkets_length + owned_length)
+    if len(data) != expected or stored_length > palette_length:
+        raise ValueError('Save is truncated or has trailing data')
+
+    world_name = bytes(data[offset:offset + world_length]).decode('utf-8')
+    offset += world_length
+    player_name = bytes(data[offset:offset + player_length]).decode('utf-8')
+    offset += player_length
+    keys, offset = read_array('I', data, offset, palette_length)
+    counts, offset = read_array('I', data, offset, stored_length)
+    trinkets, offset = read_array('H', data, offset, trinkets_length)
+    owned, offset = read_array('H', data, offset, owned_length)
+
+    palette = [ids.item(key) for key in keys]
+    stored = dict(zip(palette, counts))
+    try:
+        item = palette.__getitem__
+        trinkets = list(map(item, trinkets))
+        owned = list(map(item, owned))
+    except IndexError:
+        raise ValueError('Save refers to an item outside its palette') from None
+
+    current_area = ids.location(area)
+    camp = ids.location(camp)
+    held = ids.item(held) if held != NO_ITEM else None
+    body = ids.item(body) if body != NO_ITEM else None
+
+    player = Entity()
+    player.is_player = True
+    player.name = player_name
+    player.level = level
+    player.target = target
+    player.attack = attack
+    player.defense = defense
+    player.speed = speed
+
+    inventory = player.inventory
+    inventory.set_items(world.all_items)
+    inventory.stored_items = stored
+    inventory.owned_items = dict.fromkeys(owned)
+    inventory.equipped_items = {
+        'Held': held,
+        'Body': body,
+        'Trinkets': trinkets,
+    }
+    inventory.recount()
+
+    # Income goes in after the stats so a level the player has earned but not yet been given
+    # is handed out on their next turn, the same as if the game had never stopped
+    player.update_stats()
+    inventory.income = income
+    player.current_health = health
+
+    world.player = player
+    world.builder.player = player
+    world.player_name = world_name
+    world.time = hour
+    world.current_area = current_area
+    world.camp = camp.name
+    world.combat = None
+
+
+def save(world, path=SAVE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(dumps(world))
+    os.replace(temp_path, path)
+
+
+def load(world, path=SAVE_PATH):
+    with open(path, 'rb') as file:
+        loads(world, file.read())
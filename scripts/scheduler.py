@@ -0,0 +1,85 @@
+import numpy as np
+from scripts.world import CAMPS, DUSK_HOUR, EXHAUSTION_HOUR
+
+
+DAY = 0
+DUSK = 1
+NIGHT = 2
+
+
+def ceil_div(a, b):
+    return -(-a // b)
+
+
+def phase(time):
+    # Same thresholds increment_time reports, for any number of characters at once
+    time = np.asarray(time)
+    return np.where(time < DUSK_HOUR, DAY, np.where(time == DUSK_HOUR, DUSK, NIGHT)).astype(np.int8)
+
+
+class Roster():
+    # The day-cycle fields of many characters side by side, one row per world
+    def __init__(self, graph, count) -> None:
+        self.graph = graph
+        self.time = np.zeros(count, dtype=np.int64)
+        self.health = np.zeros(count, dtype=np.int64)
+        self.max_health = np.zeros(count, dtype=np.int64)
+        self.area = np.zeros(count, dtype=np.int32)
+        self.camp = np.zeros(count, dtype=np.int32)
+        self.days = np.zeros(count, dtype=np.int64)
+
+        # Where resting at each location takes a character, and the camp it leaves them with
+        self.camp_after = np.arange(len(graph.locations), dtype=np.int32)
+        for i, name in enumerate(graph.names):
+            if name in CAMPS:
+                self.camp_after[i] = graph.id(CAMPS[name])
+
+    def __len__(self):
+        return len(self.time)
+
+    @classmethod
+    def from_worlds(cls, worlds, graph):
+        roster = cls(graph, len(worlds))
+        for i, world in enumerate(worlds):
+            roster.time[i] = world.time
+            roster.health[i] = world.player.current_health
+            roster.max_health[i] = world.player.max_health
+            roster.area[i] = graph.id(world.current_area.name)
+            roster.camp[i] = graph.id(world.camp)
+        return roster
+
+    def advance(self, hours, step=1):
+        # The same as calling increment_time(step) hours // step times for every character, in one pass;
+        # hours can be one number or one per character, returns how many times each one rested
+        hours = np.broadcast_to(np.asarray(hours, dtype=np.int64), self.time.shape)
+        if step < 1:
+            raise ValueError('step must be at least one hour, got {}'.format(step))
+        calls = hours // step
+
+        # Calls until the first rest from the current hour, then between rests from a fresh day
+        first = np.maximum(ceil_div(EXHAUSTION_HOUR - self.time, step), 1)
+        cycle = ceil_div(EXHAUSTION_HOUR, step)
+
+        rested = calls >= first
+        after = np.where(rested, calls - first, 0)
+        rests = np.where(rested, 1 + after // cycle, 0)
+        self.time = np.where(rested, (after % cycle) * step, self.time + calls * step)
+
+        # Resting resets health and goes back to camp, which may hand out a new camp
+        self.health = np.where(rested, self.max_health, self.health)
+        self.area = np.where(rested, self.camp, self.area).astype(np.int32)
+        self.camp = np.where(rested, self.camp_after[self.camp], self.camp).astype(np.int32)
+        self.days += rests
+        return rests
+
+    def phase(self):
+        return phase(self.time)
+
+    def apply(self, worlds):
+        # Written back field by field, nothing else about the worlds is touched
+        locations = self.graph.locations
+        for i, world in enumerate(worlds):
+            world.time = int(self.time[i])
+            world.player.current_health = int(self.health[i])
+            world.current_area = locations[self.area[i]]
+            world.camp = locations[self.camp[i]].name
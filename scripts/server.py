@@ -0,0 +1,161 @@
+import asyncio
+import os
+import time
+import traceback
+from random import Random
+from scripts.world import World, QUIT, AREA
+from scripts.content import load_content
+from scripts.output import SessionSink, use_sink, reset_sink, say
+from scripts.reload import Reloader, make_watcher
+from scripts.replay import EventLog
+from scripts.scheduler import Roster
+
+
+HOST = '127.0.0.1'
+PORT = 4000
+
+# Every tick, players waiting at the location menu lose this many hours of daylight
+IDLE_TICK = 60.0
+IDLE_HOURS = 1
+
+
+class Session():
+    def __init__(self, content, reader, writer, seed=None, log_path=None) -> None:
+        self.world = World(content, seed)
+        self.reader = reader
+        self.writer = writer
+        self.sink = SessionSink(writer)
+        self.log = EventLog.attach(self.world, log_path) if log_path is not None else None
+
+    async def flush(self):
+        self.sink.flush()
+        await self.writer.drain()
+
+    def redraw(self):
+        # Called from the idle tick, outside this session's task, so its sink is set just for the screen
+        token = use_sink(self.sink)
+        try:
+            say()
+            self.sink.write(self.world.show())
+        finally:
+            reset_sink(token)
+        self.sink.flush()
+
+    async def run(self):
+        # Each connection runs in its own task, so this only redirects this session's text
+        use_sink(self.sink)
+        self.world.create_character()
+
+        while self.world.state != QUIT:
+            self.sink.write(self.world.show())
+            await self.flush()
+
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.world.state = self.world.step(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+
+        await self.flush()
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+class Server():
+    def __init__(self, content=None, host=HOST, port=PORT, seed=None, watch=False, log_dir=None,
+                 idle_tick=IDLE_TICK) -> None:
+        if content is None:
+            # Watched content is lenient, a half-finished edit only skips the name it breaks
+            content = load_content(strict=not watch)
+        self.content = content
+        self.host = host
+        self.port = port
+        # With a server seed every session gets its own seed from it, in order of connection
+        self.seeds = Random(seed) if seed is not None else None
+        self.sessions = set()
+        self.watch = watch
+        self.reloading = None
+        # Every session's input is logged here when set, so it can be replayed after a crash
+        self.log_dir = log_dir
+        self.connections = 0
+        # Seconds between idle ticks, None leaves the day standing still between prompts
+        self.idle_tick = idle_tick
+        self.ticking = None
+
+    async def handle(self, reader, writer):
+        seed = self.seeds.getrandbits(64) if self.seeds is not None else None
+        self.connections += 1
+        log_path = None
+        if self.log_dir is not None:
+            log_path = os.path.join(self.log_dir, 'session-{}-{}.log'.format(int(time.time()), self.connections))
+        session = Session(self.content, reader, writer, seed, log_path)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self.sessions.discard(session)
+            session.close()
+            writer.close()
+
+    def advance_idle(self, hours):
+        # Only players sitting at the location menu are moved on, nobody is pulled out of a fight or their bag.
+        # Saved characters are not sessions, their day stays where it was when they quit until they continue
+        sessions = [session for session in self.sessions if session.world.state == AREA]
+        if not sessions:
+            return 0
+        worlds = [session.world for session in sessions]
+        before = [(world.current_area, world.state) for world in worlds]
+        roster = Roster.from_worlds(worlds, self.content.graph)
+        rests = roster.advance(hours)
+        roster.apply(worlds)
+        for session, (area, state) in zip(sessions, before):
+            # Logged so a replay moves the day on at the same point
+            if session.log is not None:
+                session.log.idle(hours)
+            # The prompt they are looking at is out of date, such as after being sent back to camp to rest
+            if session.world.current_area is not area or session.world.state != state:
+                session.redraw()
+        return int(rests.sum())
+
+    async def tick(self):
+        while True:
+            await asyncio.sleep(self.idle_tick)
+            self.advance_idle(IDLE_HOURS)
+
+    async def reload_assets(self):
+        # Waiting happens on a thread, the patching itself runs between session steps on the loop
+        loop = asyncio.get_running_loop()
+        watcher = make_watcher()
+        reloader = Reloader(self.content)
+        try:
+            while True:
+                for path in await loop.run_in_executor(None, watcher.changes, 1.0):
+                    if reloader.reload(path):
+                        print('Reloaded {} in {:.1f}ms'.format(path, reloader.timings[-1][1] * 1000))
+        finally:
+            watcher.close()
+
+    async def serve(self):
+        if self.watch:
+            self.reloading = asyncio.create_task(self.reload_assets())
+        if self.idle_tick is not None:
+            self.ticking = asyncio.create_task(self.tick())
+        try:
+            server = await asyncio.start_server(self.handle, self.host, self.port)
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in (self.ticking, self.reloading):
+                if task is not None:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            self.ticking = None
+            self.reloading = None
@@ -0,0 +1,222 @@
+import numpy as np
+from scripts.entity import CRIT_CHANCE
+from scripts.enemy import EnemyTemplate
+
+
+MAX_TURNS = 100
+BATCH_SIZE = 20000
+TURN_BLOCK = 8
+
+PLAYER_WIN = 1
+ENEMY_WIN = -1
+UNRESOLVED = 0
+
+
+def merge_histogram(histogram, other):
+    size = max(len(histogram), len(other))
+    merged = np.zeros(size, dtype=np.int64)
+    merged[:len(histogram)] += histogram
+    merged[:len(other)] += other
+    return merged
+
+
+class SimulationResult():
+    def __init__(self, player_name, enemy_name) -> None:
+        self.player_name = player_name
+        self.enemy_name = enemy_name
+
+        self.winner = np.zeros(0, dtype=np.int8)
+        self.turns = np.zeros(0, dtype=np.int32)
+        self.player_damage = np.zeros(0, dtype=np.int64)
+        self.enemy_damage = np.zeros(0, dtype=np.int64)
+
+        self.player_hits = np.zeros(0, dtype=np.int64)
+        self.enemy_hits = np.zeros(0, dtype=np.int64)
+
+    def add_batch(self, batch):
+        self.winner = np.concatenate((self.winner, batch.winner))
+        self.turns = np.concatenate((self.turns, batch.turns))
+        self.player_damage = np.concatenate((self.player_damage, batch.player_damage))
+        self.enemy_damage = np.concatenate((self.enemy_damage, batch.enemy_damage))
+
+        self.player_hits = merge_histogram(self.player_hits, batch.player_hits)
+        self.enemy_hits = merge_histogram(self.enemy_hits, batch.enemy_hits)
+
+
+    @property
+    def fights(self):
+        return len(self.winner)
+
+    @property
+    def win_rate(self):
+        return self.rate(PLAYER_WIN)
+
+    @property
+    def loss_rate(self):
+        return self.rate(ENEMY_WIN)
+
+    @property
+    def unresolved_rate(self):
+        return self.rate(UNRESOLVED)
+
+    def rate(self, outcome):
+        if not self.fights:
+            return 0.0
+        return float(np.count_nonzero(self.winner == outcome)) / self.fights
+
+    def turns_to_kill(self):
+        return self.turns[self.winner == PLAYER_WIN]
+
+    def turns_to_die(self):
+        return self.turns[self.winner == ENEMY_WIN]
+
+    def summary(self):
+        kills = self.turns_to_kill()
+        deaths = self.turns_to_die()
+        return {
+            'player': self.player_name,
+            'enemy': self.enemy_name,
+            'fights': self.fights,
+            'win_rate': self.win_rate,
+            'loss_rate': self.loss_rate,
+            'unresolved_rate': self.unresolved_rate,
+            'mean_turns_to_kill': float(kills.mean()) if len(kills) else None,
+            'median_turns_to_kill': float(np.median(kills)) if len(kills) else None,
+            'mean_turns_to_die': float(deaths.mean()) if len(deaths) else None,
+            'mean_player_damage': float(self.player_damage.mean()) if self.fights else None,
+            'mean_enemy_damage': float(self.enemy_damage.mean()) if self.fights else None,
+        }
+
+    def turn_counts(self, outcome, max_turns):
+        # Fights with this outcome by the turn they ended on, turn 1 at index 0
+        turns = self.turns[self.winner == outcome]
+        return np.bincount(turns - 1, minlength=max_turns)[:max_turns]
+
+
+class Batch():
+    def __init__(self, size, max_turns) -> None:
+        self.winner = np.full(size, UNRESOLVED, dtype=np.int8)
+        self.turns = np.full(size, max_turns, dtype=np.int32)
+        self.player_damage = np.zeros(size, dtype=np.int64)
+        self.enemy_damage = np.zeros(size, dtype=np.int64)
+
+        self.player_hits = np.zeros(0, dtype=np.int64)
+        self.enemy_hits = np.zeros(0, dtype=np.int64)
+
+    def add_hits(self, rows, dealt, player):
+        # Swings after the killing blow are marked -1 and left out
+        taken = dealt >= 0
+        totals = np.where(taken, dealt, 0).sum(axis=1)
+        counts = np.bincount(dealt[taken])
+
+        if player:
+            self.player_damage[rows] += totals
+            self.player_hits = merge_histogram(self.player_hits, counts)
+        else:
+            self.enemy_damage[rows] += totals
+            self.enemy_hits = merge_histogram(self.enemy_hits, counts)
+
+
+class Fighter():
+    def __init__(self, entity) -> None:
+        if isinstance(entity, EnemyTemplate):
+            entity = entity.spawn()
+        self.name = entity.name
+        self.health = entity.max_health
+        self.low, self.high = entity.attack_range()
+        self.crit_modifier = entity.crit_modifier()
+        self.crit_bonus = entity.crit_bonus()
+        self.reduction = entity.damage_reduction()
+
+
+class Simulator():
+    def __init__(self, max_turns=MAX_TURNS, batch_size=BATCH_SIZE) -> None:
+        self.max_turns = max_turns
+        self.batch_size = batch_size
+
+    def order(self, player, enemy):
+        # Mirrors Combat.add_combatant with the player added first
+        if enemy.speed > player.speed:
+            return Fighter(enemy), Fighter(player), False
+        return Fighter(player), Fighter(enemy), True
+
+    def batches(self, count):
+        while count > 0:
+            size = min(count, self.batch_size)
+            count -= size
+            yield size
+
+    def blocks(self):
+        # Blocks have an even width so the first fighter always swings on even columns
+        for offset in range(0, self.max_turns, TURN_BLOCK):
+            yield offset, min(TURN_BLOCK, self.max_turns - offset)
+
+    def roll_dice(self, rng, first, second, count, width):
+        first_swings = np.arange(width) % 2 == 0
+        low = np.where(first_swings, first.low, second.low)
+        high = np.where(first_swings, first.high, second.high)
+
+        rolls = rng.integers(low, high + 1, size=(count, width), dtype=np.int32)
+        crits = rng.integers(1, 101, size=(count, width), dtype=np.int32)
+        return rolls, crits
+
+    def record(self, batch, rows, dealt, player_first):
+        batch.add_hits(rows, dealt[:, 0::2], player_first)
+        batch.add_hits(rows, dealt[:, 1::2], not player_first)
+
+    def finish(self, batch, rows, first_won, turns, player_first):
+        batch.winner[rows] = np.where(first_won == player_first, PLAYER_WIN, ENEMY_WIN)
+        batch.turns[rows] = turns
+
+    def run(self, player, enemy, count, seed=None):
+        rng = np.random.default_rng(seed)
+        first, second, player_first = self.order(player, enemy)
+        result = SimulationResult(player.name, enemy.name)
+
+        for size in self.batches(count):
+            batch = Batch(size, self.max_turns)
+            first_health = np.full(size, first.health, dtype=np.int64)
+            second_health = np.full(size, second.health, dtype=np.int64)
+            active = np.arange(size)
+
+            for offset, width in self.blocks():
+                if not len(active):
+                    break
+
+                rolls, crits = self.roll_dice(rng, first, second, len(active), width)
+                first_swings = np.arange(width) % 2 == 0
+                crit_modifier = np.where(first_swings, first.crit_modifier, second.crit_modifier)
+                crit_bonus = np.where(first_swings, first.crit_bonus, second.crit_bonus)
+                reduction = np.where(first_swings, second.reduction, first.reduction)
+
+                damage = np.where(crits - crit_modifier <= CRIT_CHANCE, rolls * 2 + crit_bonus, rolls)
+                dealt = np.maximum(damage - reduction, 0)
+
+                # Each side's swings are independent, so the killing blow is the first
+                # swing where that side's running total reaches the defender's health
+                first_dead = np.cumsum(dealt[:, 0::2], axis=1) >= second_health[active, None]
+                second_dead = np.cumsum(dealt[:, 1::2], axis=1) >= first_health[active, None]
+
+                first_kill = np.where(first_dead.any(axis=1), first_dead.argmax(axis=1) * 2, width)
+                second_kill = np.where(second_dead.any(axis=1), second_dead.argmax(axis=1) * 2 + 1, width)
+                end = np.minimum(first_kill, second_kill)
+
+                dealt[np.arange(width) > end[:, None]] = -1
+                self.record(batch, active, dealt, player_first)
+                second_health[active] -= np.maximum(dealt[:, 0::2], 0).sum(axis=1)
+                first_health[active] -= np.maximum(dealt[:, 1::2], 0).sum(axis=1)
+
+                finished = end < width
+                self.finish(batch, active[finished], first_kill[finished] < second_kill[finished],
+                            offset + end[finished] + 1, player_first)
+                active = active[~finished]
+
+            result.add_batch(batch)
+
+        return result
+
+    def sweep(self, player, enemies, count, seed=None):
+        results = {}
+        for enemy in enemies:
+            results[enemy.name] = self.run(player, enemy, count, seed)
+        return results
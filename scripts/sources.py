@@ -0,0 +1,51 @@
+import hashlib
+import os
+from scripts.builder import LOCATION_PATH, ENEMY_PATH, ITEM_PATH
+
+
+def hash_file(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def source_files():
+    # Every asset file the builder reads, in the order it reads them
+    found = []
+    for source in [LOCATION_PATH, ENEMY_PATH, ITEM_PATH]:
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.txt'):
+                    found.append(os.path.join(dirpath, filename))
+    return found
+
+
+def content_digest(hashes):
+    # One digest over every file's path and contents, so an edit, a new file or a removed one all change it
+    digest = hashlib.sha1()
+    for path in sorted(hashes):
+        digest.update('{}\0{}\0'.format(path, hashes[path]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def source_manifest(known=None):
+    # Path to [mtime_ns, size, content hash]; a file whose size and mtime still match a known entry
+    # keeps that entry's hash without being read again
+    manifest = {}
+    for path in source_files():
+        stat = file_stat(path)
+        entry = known.get(path) if known else None
+        if entry is not None and entry[:2] == stat:
+            manifest[path] = entry
+        else:
+            manifest[path] = stat + [hash_file(path)]
+    return manifest
+
+
+def manifest_digest(manifest):
+    return content_digest({path: entry[2] for path, entry in manifest.items()})
@@ -0,0 +1,131 @@
+import json
+import os
+from scripts.builder import Builder
+from scripts.graph import WorldGraph
+from scripts.item import GEAR_STATS, TRINKET_STATS
+from scripts.output import NullSink, use_sink, reset_sink
+from scripts.registry import normalize, is_global
+from scripts.sources import source_manifest, manifest_digest
+from scripts.world import CAMPS
+
+
+CACHE_PATH = 'assets/validation.cache'
+CACHE_VERSION = 1
+
+EXPECTED_STATS = {
+    'weapon': GEAR_STATS,
+    'armor': GEAR_STATS,
+    'crafting': GEAR_STATS,
+    'trinket': TRINKET_STATS,
+}
+
+
+class Validator():
+    def __init__(self, cache_path=CACHE_PATH) -> None:
+        self.cache_path = cache_path
+        self.cached = False
+
+    def read_cache(self):
+        try:
+            with open(self.cache_path, 'r') as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if cache.get('version') != CACHE_VERSION:
+            return None
+        return cache
+
+    def write_cache(self, files, digest, problems):
+        temp_path = self.cache_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'version': CACHE_VERSION, 'files': files, 'digest': digest, 'problems': problems}, file)
+        os.replace(temp_path, self.cache_path)
+
+    def validate(self, use_cache=True):
+        cache = self.read_cache() if use_cache else None
+        known = cache['files'] if cache else {}
+
+        # Only files whose size or mtime moved are read again, the rest reuse their cached hash
+        files = source_manifest(known)
+        digest = manifest_digest(files)
+
+        self.cached = cache is not None and cache['digest'] == digest
+        if self.cached:
+            problems = cache['problems']
+            if files != known:
+                self.write_cache(files, digest, problems)
+            return problems
+
+        problems = self.check()
+        if use_cache:
+            self.write_cache(files, digest, problems)
+        return problems
+
+    def check(self):
+        # Everything is loaded the same way the game does, with the builder's own messages muted
+        builder = Builder()
+        token = use_sink(NullSink())
+        try:
+            area_list = builder.build_areas()
+            enemy_list = builder.build_enemies()
+            item_list = builder.build_items()
+        finally:
+            reset_sink(token)
+
+        problems = []
+        for path, message in builder.errors:
+            problems.append('{}: {}'.format(path, message))
+
+        problems.extend(self.check_duplicates('location', area_list))
+        problems.extend(self.check_duplicates('enemy', enemy_list))
+        problems.extend(self.check_duplicates('item', item_list))
+        problems.extend(self.check_locations(area_list, enemy_list))
+        problems.extend(self.check_items(area_list, item_list))
+        return problems
+
+    def check_duplicates(self, kind, things):
+        problems = []
+        seen = set()
+        for thing in things:
+            key = normalize(thing.name)
+            if key in seen:
+                problems.append('There is more than one {} named {}'.format(kind, thing.name))
+            seen.add(key)
+        return problems
+
+    def check_locations(self, area_list, enemy_list):
+        problems = []
+        graph = WorldGraph(area_list)
+
+        starts = []
+        for name in list(CAMPS) + list(CAMPS.values()):
+            if normalize(name) not in graph.ids:
+                problems.append('Camp table names {}, which does not exist'.format(name))
+            elif name not in starts:
+                starts.append(name)
+        problems.extend(graph.validate(*starts))
+
+        enemies = set(normalize(enemy.name) for enemy in enemy_list)
+        for location in area_list:
+            for name in location.enemies:
+                if normalize(name) not in enemies:
+                    problems.append('{} lists enemy {}, which does not exist'.format(location.name, name))
+        return problems
+
+    def check_items(self, area_list, item_list):
+        problems = []
+        locations = set(normalize(location.name) for location in area_list)
+        for item in item_list:
+            if item.type == 'Unknown':
+                problems.append('{} does not have a known item type'.format(item.name))
+
+            expected = EXPECTED_STATS.get(item.type)
+            if expected is not None and tuple(item.stat_modifiers) != expected:
+                problems.append('{} is a {} but has {} stats, expected {}'.format(
+                    item.name, item.type, ', '.join(item.stat_modifiers) or 'no', ', '.join(expected)))
+
+            if not is_global(item):
+                for area in item.spawn_location:
+                    if normalize(area) not in locations:
+                        problems.append('{} spawns in {}, which does not exist'.format(item.name, area))
+        return problems
@@ -5,9 +5,12 @@ from scripts.builder import Builder
 from scripts.location import Location
 from scripts.inventory import Inventory
 from scripts.loot import Loot
+from scripts.content import load_content
+from scripts.output import say, flush
+from scripts.dice import Dice
+from scripts import save
 import sys
 import os
-import random
 
 
 LOCATION_PATH = 'assets/locations/'
@@ -15,66 +18,160 @@ ENEMY_PATH = 'assets/enemies/'
 ART_PATH = 'assets/art/'
 SOUND_PATH = 'assets/sound/'
 
+# Game loop states, each one is a screen that shows a prompt and handles one line of input
+NAME = 'name'
+BACKGROUND = 'background'
+AREA = 'area'
+MOVE = 'move'
+FIGHT = 'fight'
+BAG = 'bag'
+INSPECT = 'inspect'
+INSPECTED = 'inspected'
+EQUIP = 'equip'
+SELL = 'sell'
+QUIT = 'quit'
+STATES = [NAME, BACKGROUND, AREA, MOVE, FIGHT, BAG, INSPECT, INSPECTED, EQUIP, SELL, QUIT]
+
+# Hours into the day, the scheduler works from the same thresholds
+DUSK_HOUR = 8
+EXHAUSTION_HOUR = 12
+
+
+# Resting anywhere in an area takes the player back to that area's camp
+CAMPS = {
+    'Lastholm': 'Lastholm',
+    'Aethelwood': 'Aethelwood',
+    'Scorlends': 'Scorlends',
+    'Shadowsun': 'Shadowsun',
+    'Shadowed residential blocks': 'Broken hearth',
+    'Petrified grove': 'Quiet glade',
+    'Scavenger\'s ridge': 'Iron spring',
+    'Magma veins': 'Last anvil',
+}
+
 
 class World():
-    def __init__(self) -> None:
+    def __init__(self, content=None, seed=None) -> None:
         self.builder = Builder()
-        self.loot = Loot()
+        self.rng = Dice(seed)
+
+        # Content is read-only, so many worlds can share one loaded set
+        if content is None:
+            content = load_content(self.builder)
+        self.content = content
+        self.loot = content.loot
         
         self.time = 0
         self.current_area = Location()
-        self.area_list = self.builder.build_areas()
+        self.area_list = content.area_list
+        self.enemy_list = content.enemy_list
+        self.all_items = content.all_items
+        self.registry = content.registry
+        self.graph = content.graph
 
         self.set_location('Lastholm')
         self.camp = 'Lastholm'
 
         self.player = Entity()
         
-        self.enemy_list = self.builder.build_enemies()
-        
-        self.all_items = self.builder.build_items()
         # for i in self.all_items:
             # print('Item {} built and added to World'.format(i.name))
 
         self.player.inventory.set_items(self.all_items)
-        self.loot.set_items(self.all_items)
+
+        self.combat = None
+        self.player_name = ''
+        self.state = NAME
+
+        # Where the game is saved on quitting, None leaves nothing behind
+        self.save_path = None
+        # Records every line of input when set, see scripts.replay
+        self.log = None
+
+        self.states = {
+            NAME: (self.display_name_prompt, self.choose_name),
+            BACKGROUND: (self.display_backgrounds, self.choose_background),
+            AREA: (self.display_current_area, self.display_location_options),
+            MOVE: (self.display_connections, self.move_area),
+            FIGHT: (self.display_fight, self.attack),
+            BAG: (self.display_bag, self.choose_bag_action),
+            INSPECT: (self.display_inspect_prompt, self.inspect_item),
+            INSPECTED: (self.display_return_prompt, self.return_to_bag),
+            EQUIP: (self.display_equip_prompt, self.equip_item),
+            SELL: (self.display_sell_prompt, self.sell_item),
+        }
+
+    def run(self, read=input):
+        while self.state != QUIT:
+            prompt = self.show()
+            flush()
+            self.state = self.step(read(prompt))
+        flush()
+
+    def show(self):
+        show, _ = self.states[self.state]
+        return show()
+
+    def step(self, line):
+        _, handle = self.states[self.state]
+        state = handle(line)
+        if self.log is not None:
+            self.log.record(self, line, state)
+        return state
 
     def create_character(self):
-        self.builder.create_character()
+        self.state = NAME
+
+    def display_name_prompt(self):
+        return 'What is your name? '
+
+    def choose_name(self, value):
+        self.player_name = value
+        say()
+        return BACKGROUND
+
+    def display_backgrounds(self):
+        self.builder.display_backgrounds()
+        return 'What is your background? '
+
+    def choose_background(self, value):
+        try:
+            background = int(value)
+        except ValueError:
+            return BACKGROUND
+
+        self.builder.create_character(self.player_name, background)
         self.player = self.builder.get_player()
         self.player.is_player = True
+        return AREA
+
+    def save_game(self, path=None):
+        save.save(self, path or self.save_path)
+        say('Your progress has been saved')
+
+    def load_game(self, path=None):
+        save.load(self, path or self.save_path)
+        self.state = AREA
 
     def set_location(self, value):
-        for i, v in enumerate(self.area_list):
-            # print('Looking for {} in {}'.format(value, v.name))
-            if v.name == value:
-                self.current_area = v
-                # print('Found {} and set current location as {}'.format(value, self.current_area.name))
-                if self.current_area.name in ['Lastholm', 'Aethelwood', 'Scorlends', 'Shadowsun']:
-                    self.camp = self.current_area.name
-                elif self.current_area.name == 'Shadowed residential blocks':
-                    self.camp = 'Broken hearth'
-                elif self.current_area.name == 'Petrified grove':
-                    self.camp = 'Quiet glade'
-                elif self.current_area.name == 'Scavenger\'s ridge':
-                    self.camp = 'Iron spring'
-                elif self.current_area.name == 'Magma veins':
-                    self.camp = 'Last anvil'
-                break
-            else:
-                # print('Area not found')
-                pass
-  
-    def move_area(self):
-        connections = self.current_area.get_connections()
+        self.current_area = self.registry.location(value)
+        # print('Found {} and set current location as {}'.format(value, self.current_area.name))
+        if self.current_area.name in CAMPS:
+            self.camp = CAMPS[self.current_area.name]
+
+    def display_connections(self):
+        connections = self.graph.connections(self.current_area.name)
         c = 1
         for i, n in enumerate(connections):
-            print('{}. {}'.format(i + 1, n))
+            say('{}. {}', i + 1, n.name)
             c += 1
-        print('{}. Stay'.format(c))
-        print()
-        new_location = input('What is your destination? ')
-        print()
+        say('{}. Stay', c)
+        say()
+        return 'What is your destination? '
+  
+    def move_area(self, new_location):
+        connections = self.graph.connections(self.current_area.name)
+        say()
 
         try:
             index = 0
@@ -82,108 +179,187 @@ class World():
                 index = int(new_location) - 1
             except:
                 name = new_location.capitalize()
-                index = connections.index(name)
+                index = [c.name for c in connections].index(name)
 
             # print('Player has moved to {}'.format(value))
-            self.set_location(connections[index])
+            self.set_location(connections[index].name)
             self.increment_time(self.current_area.travel_time)
-            self.display_current_area()
         except:
-            self.display_current_area()
+            pass
+        return AREA
 
     def display_current_area(self):
         self.player.update_stats()        
-        print('Current location: {}'.format(self.current_area.name))
-        print()
-        print(self.current_area.description)
-        print()
-        print(self.display_location_options())
+        say('Current location: {}', self.current_area.name)
+        say()
+        say(self.current_area.description)
+        say()
+        say('1. Fight')
+        say('2. Travel')
+        say('3. Rest')
+        if self.current_area.name == self.camp:
+            say('4. Prepare')
+        say()
+        return 'What will you do? '
+
+    def route_to_camp(self):
+        return self.graph.route_to_camp(self.current_area.name, self.camp)
 
     def increment_time(self, value):
         self.time += value
-        print('You are on hour {}'.format(self.time))
+        say('You are on hour {}', self.time)
 
-        if self.time >= 12:
-            print('Exhaustion takes you')
+        if self.time >= EXHAUSTION_HOUR:
+            say('Exhaustion takes you')
             self.rest()
-        elif self.time > 8:
-            print('Night has fallen')
-        elif self.time == 8:
-            print('Dusk is upon you')
-        elif self.time < 8:
-            print('You have daylight yet')
+        elif self.time > DUSK_HOUR:
+            say('Night has fallen')
+        elif self.time == DUSK_HOUR:
+            say('Dusk is upon you')
+        elif self.time < DUSK_HOUR:
+            say('You have daylight yet')
 
     def start_day(self):
         self.time = 0
-        print('A new dawn breaks')
+        say('A new dawn breaks')
 
     def rest(self):
         self.start_day()
         self.player.reset_health()
         self.set_location(self.camp)
-        self.display_current_area()
 
-    def display_location_options(self):
-        print('1. Fight')
-        print('2. Travel')
-        print('3. Rest')
-        if self.current_area.name == self.camp:
-            print('4. Prepare')
-        print()
-        choice = input('What will you do? ')
-        print()
-
-        if int(choice) == 1:
-            if not self.current_area.enemies:
-                print('There are no enemies here...')
-            else:
-                self.fight()
-                self.increment_time(1)
-            self.display_current_area()
-
-        elif int(choice) == 2:
-            self.move_area()
-
-        elif int(choice) == 3:    
+    def display_location_options(self, choice):
+        say()
+        try:
+            choice = int(choice)
+        except ValueError:
+            return AREA
+
+        if choice == 1:
+            # Checked against the pool, names that matched no enemy are not in it
+            if not self.registry.enemy_pool(self.current_area.name):
+                say('There are no enemies here...')
+                return AREA
+            return self.fight()
+
+        elif choice == 2:
+            return MOVE
+
+        elif choice == 3:    
             self.rest()
+            return AREA
 
-        elif int(choice) == 4:
-            self.prepare()
+        elif choice == 4:
+            return self.prepare()
         else:
-            sys.exit()
+            if self.save_path is not None:
+                self.save_game()
+            return QUIT
 
     def fight(self):
-        fight = Combat(self.current_area.name, self.loot)
+        self.combat = Combat(self.current_area.name, self.loot, self.rng)
         player = self.player
         player.print_entity()
 
         enemy = self.generate_enemy()
 
-        fight.add_combatant(player)
-        fight.add_combatant(enemy)
-        fight.print_combatants()
-        fight.start_combat()
+        self.combat.add_combatant(player)
+        self.combat.add_combatant(enemy)
+        self.combat.print_combatants()
+        self.combat.start_combat()
+        return self.end_fight()
+
+    def display_fight(self):
+        say('It\'s your turn!\n')
+        return 'Press enter to attack.\n'
+
+    def attack(self, _):
+        self.combat.player_attack()
+        return self.end_fight()
+
+    def end_fight(self):
+        if self.combat.run:
+            return FIGHT
+
+        self.combat = None
+        self.increment_time(1)
+        return AREA
 
     def generate_enemy(self):
         # print('Generating enemy')
         
-        enemy_pool = self.current_area.get_enemies()
+        enemy_pool = self.registry.enemy_pool(self.current_area.name)
         # print(enemy_pool)
         
-        selected_enemy = random.choice(enemy_pool)
-        # print('Selected enemy {}'.format(selected_enemy))
-        for i, v in enumerate(self.enemy_list):
-            if v.name == selected_enemy:
-                enemy = v
-                enemy.reset_health()
-                enemy.print_entity()
-                return enemy
-            else:
-                # print('No enemy found named {}'.format(selected_enemy))
-                pass
+        # Templates are shared, every fight gets its own instance
+        enemy = self.rng.choice(enemy_pool).spawn()
+        # print('Selected enemy {}'.format(enemy.name))
+        enemy.print_entity()
+        return enemy
 
     def prepare(self):
         self.player.print_entity()
         self.player.inventory.open_bag()
-        print()
-        self.display_current_area()
\ No newline at end of file
+        return BAG
+
+    def display_bag(self):
+        self.player.inventory.display_bag()
+        return 'What would you like to do? '
+
+    def choose_bag_action(self, action):
+        try:
+            action = int(action)
+        except ValueError:
+            return BAG
+
+        if action == 1:
+            return INSPECT
+        elif action == 2:
+            return EQUIP
+        elif action == 3:
+            return SELL
+        elif action == 4:
+            say()
+            return AREA
+        return BAG
+
+    def choose_bag_item(self, choice):
+        say()
+        try:
+            return self.player.inventory.item_at(int(choice) - 1)
+        except (ValueError, IndexError):
+            return None
+
+    def display_inspect_prompt(self):
+        return 'Which item would you like to inspect? '
+
+    def inspect_item(self, choice):
+        item = self.choose_bag_item(choice)
+        if item is None:
+            return BAG
+        item.display()
+        return INSPECTED
+
+    def display_return_prompt(self):
+        return 'Press enter to return'
+
+    def return_to_bag(self, _):
+        return BAG
+
+    def display_equip_prompt(self):
+        return 'What would you like to equip? '
+
+    def equip_item(self, choice):
+        item = self.choose_bag_item(choice)
+        if item is not None:
+            self.player.inventory.equip_item(item)
+        return BAG
+
+    def display_sell_prompt(self):
+        return 'What would you like to sell? '
+
+    def sell_item(self, choice):
+        item = self.choose_bag_item(choice)
+        if item is not None:
+            self.player.inventory.sell_wealth(item)
+        return BAG
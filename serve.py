@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import os
+from scripts.profiler import Profiler
+from scripts.server import Server, HOST, PORT, IDLE_TICK
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Host MiniQuest for many players over TCP.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--seed', type=int, default=None, help='seed for reproducible sessions')
+    parser.add_argument('--watch', action='store_true', help='reload asset files as they are edited')
+    parser.add_argument('--log-dir', default=None, help='record every session for replay.py')
+    parser.add_argument('--idle-tick', type=float, default=IDLE_TICK,
+                        help='seconds per hour that passes for players at the location menu, 0 to stop the clock')
+    parser.add_argument('--profile', action='store_true', help='print where the time went on shutdown')
+    parser.add_argument('--trace', default=None, help='write a Chrome trace of every timed call on shutdown')
+    parser.add_argument('--metrics', default=None, help='write Prometheus text metrics on shutdown')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    # Enabled before the server loads its content so the build is timed too
+    profiler = None
+    if args.profile or args.trace or args.metrics:
+        profiler = Profiler(trace=args.trace is not None).enable()
+    server = Server(host=args.host, port=args.port, seed=args.seed, watch=args.watch, log_dir=args.log_dir,
+                    idle_tick=args.idle_tick or None)
+    print('Serving MiniQuest on {}:{}'.format(args.host, args.port))
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            if args.profile:
+                print('\n'.join(profiler.report()))
+            if args.trace:
+                profiler.write_trace(args.trace)
+                print('Trace saved to: {}'.format(args.trace))
+            if args.metrics:
+                profiler.write_metrics(args.metrics)
+                print('Metrics saved to: {}'.format(args.metrics))
+
+
+main()
@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+import time
+from scripts.validator import Validator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check every asset file and the references between them.')
+    parser.add_argument('--no-cache', action='store_true', help='check everything even if nothing changed')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    validator = Validator()
+    start = time.perf_counter()
+    problems = validator.validate(use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    for problem in problems:
+        print(problem)
+    print('')
+    print('{} problems found in {:.3f}s{}'.format(len(problems), elapsed, ' (cached)' if validator.cached else ''))
+    sys.exit(1 if problems else 0)
+
+
+main()